@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+from backend.core.profiling import get_profile_path, is_profiling_token
+import os
+import re
+
+
+router = APIRouter()
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_profile_token: str = Header(None)):
+    """
+    Download a stored request profile.
+    """
+    if not is_profiling_token(x_profile_token):
+        raise HTTPException(status_code=403, detail="Profiling is not enabled for this client")
+    
+    if not re.fullmatch(r"[0-9a-f]{32}", profile_id):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    path = get_profile_path(profile_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    return FileResponse(path, media_type="application/json")
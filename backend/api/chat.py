@@ -1,109 +1,306 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from backend.db.session import get_db
+from backend.db.session import get_db, get_read_db, mark_written, SessionLocal
 from backend.schemas.chat import (
     ChatRequest,
     ChatResponse,
     ChatMessage,
+    MessagePage,
     DocumentUploadResponse,
     ConversationCreate,
     ConversationResponse,
     ConversationListResponse,
+    GuidedQuestion,
+    GuidedAnswerResponse,
 )
-from backend.rag.chain import (
-    get_conversational_chain,
-    ask_question
+from backend.rag.chain import get_conversational_chain
+from backend.rag.indexing import BUILD_STATUS, run_build, start_build
+from backend.rag.retriever import get_collection_stats, get_index_generation
+from backend.rag.guided_answers import (
+    find_guided_answer,
+    get_guided_answer,
+    list_guided_questions,
+    precompute_guided_answers,
 )
-from backend.rag.ingestion import load_documents, split_documents
-from backend.rag.retriever import add_documents_to_vectorstore, get_collection_stats, get_vectorstore
-from backend.rag.retriever import similarity_search
-from backend.db.models import Conversation, Message, Document as DocumentModel
+from backend.rag.guided_flow import get_guided_flow
+from backend.rag.retriever import build_filter, similarity_search
+from backend.rag.singleflight import SingleFlight, request_key
+from backend.core.cache import get_cache
+from backend.core.config import settings
+from backend.core.prompts import NO_INFORMATION_ANSWER
+from backend.core.resilience import get_llm_stats
+from backend.core.metrics import record_cache, track_stage
+from backend.core.responses import FastJSONResponse
+from backend.db.models import ArchivedConversation, Conversation, Message, Document as DocumentModel
+from backend.db.archive import delete_conversations, get_archived_messages
 from datetime import datetime, timezone
+import hashlib
+import json
 import shutil
 import os
-from typing import List
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional
 
 
 router = APIRouter()
 
 
-# In-memory storage for chains (in production, use Redis or similar)
-conversation_chains = {}
+# Identical questions in flight at the same time share one retrieval + LLM call
+inflight = SingleFlight()
+
+# Conversations created by a chat request are titled with this many words of the first message
+MAX_TITLE_WORDS = 8
+
 
 async def safe_context(docs: list) -> str:
     if not docs:
         return "NO_RELEVANT_CONTEXT"
     return "\n\n".join(d.page_content for d in docs)
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(
-    request: ChatRequest,
-    db: Session = Depends(get_db)
-):
+
+def conversation_title(message: str) -> str:
     """
-    Chat endpoint for conversational question answering.
+    Title a new conversation after the first words of its first message.
+    """
+    words = message.strip().split()
+    title = " ".join(words[:MAX_TITLE_WORDS])
+    return title + "..." if len(words) > MAX_TITLE_WORDS else title or "New Conversation"
+
+
+def validate_filters(filters: Optional[Dict]) -> None:
+    """
+    Reject unsupported filters with a 400 before anything is written.
+    """
+    try:
+        build_filter(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def get_or_create_conversation(db: Session, conversation_id: Optional[int], message: str) -> Conversation:
+    """
+    Load the requested conversation, or create a new one titled after the
+    message when no ID is given.
     """
-    # Get or create conversation
-    conversation_id = request.conversation_id
     if conversation_id is None:
-        conversation = Conversation(title=f"{conversation_id}.New Chat")
+        conversation = Conversation(title=conversation_title(message))
         db.add(conversation)
         db.commit()
         db.refresh(conversation)
-        conversation_id = conversation.id
-    else:
-        conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
-        if not conversation:
-            raise HTTPException(status_code=404, detail="Conversation not found")
+        return conversation
     
-    # Get conversation history
+    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    if not conversation:
+        # Archived conversations keep their history but take no new messages
+        if db.get(ArchivedConversation, conversation_id) is not None:
+            raise HTTPException(status_code=409, detail="Conversation is archived; its history is read-only")
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return conversation
+
+
+def format_chat_history(db: Session, conversation_id: int) -> str:
+    """
+    Format the stored conversation history for the prompt.
+    """
     messages = db.query(Message).filter(Message.conversation_id == conversation_id).order_by(Message.created_at).all()
     chat_history = [(msg.role, msg.content) for msg in messages]
-    
+    return "\n".join(
+        f"Human: {q}\nAssistant: {a}"
+        for q, a in chat_history
+    )
+
+
+def save_exchange(db: Session, conversation: Conversation, question: str, answer: str) -> None:
+    """
+    Persist a question/answer pair and bump the conversation timestamp.
+    """
+    db.add(Message(conversation_id=conversation.id, role="user", content=question))
+    db.add(Message(conversation_id=conversation.id, role="assistant", content=answer))
+    conversation.updated_at = datetime.now(timezone.utc)
+    db.commit()
+    mark_written(conversation.id)
+
+
+async def retrieve_context(question: str, filters: Optional[Dict]) -> str:
+    try:
+        with track_stage("retrieval"):
+            docs = await run_in_threadpool(similarity_search, question, 5, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await safe_context(docs)
+
+
+@lru_cache(maxsize=1)
+def get_chain():
+    # History is passed in explicitly, so one stateless chain serves every conversation
+    return get_conversational_chain()
+
+
+def answer_cache_key(key: str) -> str:
+    # Answers are tied to the index generation, so re-indexing invalidates them
+    return f"answer:{get_index_generation()}:{key}"
+
+
+def get_cached_answer(key: str) -> Optional[str]:
+    """
+    Look up a previously generated answer in the shared cache.
+    """
+    if not settings.answer_cache_enabled:
+        return None
+    answer = get_cache().get(answer_cache_key(key))
+    record_cache("answers", answer is not None)
+    return answer
+
+
+def cache_answer(key: str, answer: str) -> None:
+    if settings.answer_cache_enabled:
+        get_cache().set(answer_cache_key(key), answer, ttl=settings.answer_cache_ttl)
+
+
+async def replay(answer: str) -> AsyncIterator[str]:
+    yield answer
+
+
+async def generate_answer(question: str, filters: Optional[Dict], chat_history: str) -> str:
+    """
+    Run retrieval and the LLM completion for a question.
+
+    The chain is given the retrieved context, so it does not search again;
+    ``chat_history`` is empty when the request does not use history.
+    """
+    # ---- guided-flow questions are answered ahead of time ----
+    if not chat_history:
+        precomputed = find_guided_answer(question, filters)
+        if precomputed:
+            return precomputed["answer"]
+
     # ---- retrieve documents FIRST ----
-    vectorstore = get_vectorstore()
-    docs = vectorstore.similarity_search(request.message, k=5)
-    context = await safe_context(docs)
+    context = await retrieve_context(question, filters)
 
     # ---- block hallucinations early ----
     if context == "NO_RELEVANT_CONTEXT":
-        answer = "I don’t have this information right now... maybe in future I can help you better."
-    else:
-        if request.use_history:
-            if conversation_id not in conversation_chains:
-                conversation_chains[conversation_id] = get_conversational_chain()
-
-            chain = conversation_chains[conversation_id]
-            answer = chain.invoke({
-                "question": request.message,
-                "context": context,
-                "chat_history": "\n".join(
-                    f"Human: {q}\nAssistant: {a}"
-                    for q, a in chat_history
-                )
-            })
-        else:
-            answer, _ = ask_question(request.message)
-    
-    # Save user message
-    user_message = Message(
-        conversation_id=conversation_id,
-        role="user",
-        content=request.message
-    )
-    db.add(user_message)
+        return NO_INFORMATION_ANSWER
+
+    chain = get_chain()
+    with track_stage("llm"):
+        return await chain.ainvoke({
+            "question": question,
+            "context": context,
+            "chat_history": chat_history
+        })
+
+
+async def stream_answer(question: str, filters: Optional[Dict], chat_history: str) -> AsyncIterator[str]:
+    """
+    Run retrieval and stream the LLM completion token by token.
+    """
+    if not chat_history:
+        precomputed = find_guided_answer(question, filters)
+        if precomputed:
+            yield precomputed["answer"]
+            return
+
+    context = await retrieve_context(question, filters)
+
+    if context == "NO_RELEVANT_CONTEXT":
+        yield NO_INFORMATION_ANSWER
+        return
+
+    inputs = {"question": question, "context": context, "chat_history": chat_history}
+    async for token in get_chain().astream(inputs):
+        yield token
+
+
+def compute_etag(*parts) -> str:
+    """
+    Build a weak ETag from the values that identify a response's version.
+    """
+    digest = hashlib.sha1(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> bool:
+    """
+    Set the ETag on the response and check it against ``If-None-Match``.
     
-    # Save assistant message
-    assistant_message = Message(
-        conversation_id=conversation_id,
-        role="assistant",
-        content=answer
-    )
-    db.add(assistant_message)
+    Clients must revalidate before reusing a cached copy.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return request.headers.get("if-none-match") == etag
+
+
+def json_response(content, response: Response) -> FastJSONResponse:
+    """
+    Serialize plain data straight to JSON, keeping headers set on ``response``.
     
-    # Update conversation
-    conversation.updated_at = datetime.now(timezone.utc)
-    db.commit()
+    Returning a response skips per-item response-model validation, which
+    dominates serialization time for long lists.
+    """
+    return FastJSONResponse(content, headers=dict(response.headers))
+
+
+def messages_version(db: Session, conversation_id: int) -> tuple:
+    """
+    Identify the current version of a conversation's messages with one aggregate query.
+    """
+    # Messages are only ever appended, so their count and newest ID identify the version
+    count, newest_id = db.query(func.count(Message.id), func.max(Message.id)).filter(
+        Message.conversation_id == conversation_id
+    ).one()
+    archived_at = None
+    if not count:
+        archived_at = db.query(ArchivedConversation.archived_at).filter(
+            ArchivedConversation.id == conversation_id
+        ).scalar()
+    return conversation_id, count, newest_id, archived_at
+
+
+def persist_streamed_exchange(conversation_id: int, question: str, answer: str) -> None:
+    """
+    Save a streamed exchange in its own session (the request's may be closed by then).
+    """
+    db = SessionLocal()
+    try:
+        save_exchange(db, db.get(Conversation, conversation_id), question, answer)
+    finally:
+        db.close()
+
+
+def sse_event(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat(
+    request: ChatRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Chat endpoint for conversational question answering.
+    """
+    validate_filters(request.filters)
+    conversation = get_or_create_conversation(db, request.conversation_id, request.message)
+    conversation_id = conversation.id
+    with track_stage("history_read"):
+        chat_history = format_chat_history(db, conversation_id) if request.use_history else ""
+
+    key = request_key(request.message, request.filters, chat_history)
+    # The cache may be a SQLite file or a Redis server, so it is used off the event loop
+    answer = await run_in_threadpool(get_cached_answer, key)
+    if answer is None:
+        answer = await inflight.do(key, lambda: generate_answer(
+            request.message,
+            request.filters,
+            chat_history
+        ))
+        await run_in_threadpool(cache_answer, key, answer)
+
+    with track_stage("persist"):
+        await run_in_threadpool(save_exchange, db, conversation, request.message, answer)
     
     return ChatResponse(
         answer=answer,
@@ -112,16 +309,129 @@ async def chat(
     )
 
 
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Streaming chat endpoint using server-sent events.
+    
+    Emits a ``conversation`` event, one ``token`` event per chunk and a final
+    ``done`` event. Identical concurrent questions share one token stream.
+    """
+    validate_filters(request.filters)
+    conversation = get_or_create_conversation(db, request.conversation_id, request.message)
+    conversation_id = conversation.id
+    with track_stage("history_read"):
+        chat_history = format_chat_history(db, conversation_id) if request.use_history else ""
+
+    key = request_key(request.message, request.filters, chat_history)
+    cached = await run_in_threadpool(get_cached_answer, key)
+    if cached is not None:
+        tokens = replay(cached)
+    else:
+        tokens = inflight.stream(key, lambda: stream_answer(
+            request.message,
+            request.filters,
+            chat_history
+        ))
+
+    async def events():
+        yield sse_event({"type": "conversation", "conversation_id": conversation_id})
+
+        parts = []
+        try:
+            async for token in tokens:
+                parts.append(token)
+                yield sse_event({"type": "token", "content": token})
+        except Exception as e:
+            yield sse_event({"type": "error", "detail": str(getattr(e, "detail", e))})
+            return
+
+        answer = "".join(parts)
+        if cached is None:
+            await run_in_threadpool(cache_answer, key, answer)
+
+        # The request-scoped session may already be closed once streaming starts
+        with track_stage("persist"):
+            await run_in_threadpool(persist_streamed_exchange, conversation_id, request.message, answer)
+
+        yield sse_event({"type": "done", "conversation_id": conversation_id})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.get("/chat/{conversation_id}/messages", response_model=List[ChatMessage])
 async def get_messages(
     conversation_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get all messages in a conversation.
+    Get all messages in a conversation, including archived ones.
+    
+    Returns 304 when the client's ``If-None-Match`` matches the current ETag.
     """
-    messages = db.query(Message).filter(Message.conversation_id == conversation_id).order_by(Message.created_at).all()
-    return [ChatMessage(role=msg.role, content=msg.content) for msg in messages]
+    if not_modified(request, response, compute_etag(messages_version(db, conversation_id))):
+        return Response(status_code=304, headers=dict(response.headers))
+    
+    messages = db.query(Message.id, Message.role, Message.content).filter(
+        Message.conversation_id == conversation_id
+    ).order_by(Message.created_at).all()
+    if not messages:
+        archived = get_archived_messages(db, conversation_id)
+        if archived:
+            return json_response(
+                [{"id": None, "role": msg["role"], "content": msg["content"]} for msg in archived],
+                response
+            )
+    return json_response(
+        [{"id": message_id, "role": role, "content": content} for message_id, role, content in messages],
+        response
+    )
+
+
+@router.get("/chat/{conversation_id}/messages/page", response_model=MessagePage)
+async def get_message_page(
+    conversation_id: int,
+    request: Request,
+    response: Response,
+    before_id: Optional[int] = None,
+    limit: int = Query(30, ge=1, le=200),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get the most recent messages of a conversation, or those before ``before_id``.
+    
+    Returns 304 when the client's ``If-None-Match`` matches the current ETag.
+    """
+    if not_modified(request, response, compute_etag(messages_version(db, conversation_id), before_id, limit)):
+        return Response(status_code=304, headers=dict(response.headers))
+    
+    query = db.query(Message.id, Message.role, Message.content).filter(Message.conversation_id == conversation_id)
+    if before_id is not None:
+        query = query.filter(Message.id < before_id)
+    # One extra row tells whether an older page exists
+    rows = query.order_by(Message.id.desc()).limit(limit + 1).all()
+    
+    if not rows:
+        archived = get_archived_messages(db, conversation_id)
+        if archived:
+            # Archived messages are paged by their (1-based) position
+            rows = [
+                (position, msg["role"], msg["content"])
+                for position, msg in enumerate(archived, start=1)
+                if before_id is None or position < before_id
+            ][::-1][:limit + 1]
+    
+    page = rows[:limit][::-1]
+    return json_response({
+        "messages": [{"id": message_id, "role": role, "content": content} for message_id, role, content in page],
+        "has_more": len(rows) > limit,
+        "next_before_id": page[0][0] if page else None
+    }, response)
 
 
 @router.post("/documents/upload", response_model=DocumentUploadResponse)
@@ -158,40 +468,59 @@ async def upload_document(
     )
 
 
-@router.post("/documents/index")
-async def index_documents(db: Session = Depends(get_db)):
+def finish_index_build(generation: int) -> None:
     """
-    Index all uploaded documents.
+    Mark documents as indexed and precompute guided answers for a newly activated generation.
+    """
+    db = SessionLocal()
+    try:
+        db.query(DocumentModel).update({
+            DocumentModel.status: "indexed",
+            DocumentModel.chunk_count: BUILD_STATUS["chunks_created"],
+            DocumentModel.file_size: BUILD_STATUS["documents_loaded"]
+        })
+        db.commit()
+    finally:
+        db.close()
+    
+    precompute_guided_answers(generation)
+
+
+@router.post("/documents/index", status_code=202)
+async def index_documents(background_tasks: BackgroundTasks):
     """
-    # Load and split documents
-    documents = load_documents()
-    chunks = split_documents(documents)
+    Rebuild the index from all uploaded documents in the background.
     
-    # Add to vector store
-    if chunks:
-        add_documents_to_vectorstore(chunks)
+    Searches keep using the current generation until the new one is built
+    and validated. Progress is reported by ``GET /documents/index``.
+    """
+    if not start_build():
+        raise HTTPException(status_code=409, detail="An index build is already running")
     
-    # Update document records
-    db.query(DocumentModel).update({
-        DocumentModel.status: "indexed",
-        DocumentModel.chunk_count: len(chunks),
-        DocumentModel.file_size: len(documents)
-    })
-    db.commit()
+    background_tasks.add_task(run_build, finish_index_build)
     
-    # Get stats
+    return {
+        "status": "scheduled",
+        "index_generation": get_index_generation()
+    }
+
+
+@router.get("/documents/index")
+async def index_status():
+    """
+    Get the progress of the latest index build and the active generation.
+    """
     stats = get_collection_stats()
     
     return {
-        "status": "completed",
-        "documents_loaded": len(documents),
-        "chunks_created": len(chunks),
+        **BUILD_STATUS,
+        "index_generation": get_index_generation(),
         "vectorstore_count": stats.get("document_count", 0)
     }
 
 
 @router.get("/documents", response_model=List[DocumentUploadResponse])
-async def list_documents(db: Session = Depends(get_db)):
+async def list_documents(db: Session = Depends(get_read_db)):
     """
     List all indexed documents.
     """
@@ -219,6 +548,7 @@ async def create_conversation(
     db.add(conversation)
     db.commit()
     db.refresh(conversation)
+    await run_in_threadpool(mark_written, conversation.id)
     
     return ConversationResponse(
         id=conversation.id,
@@ -230,29 +560,48 @@ async def create_conversation(
 
 @router.get("/conversations", response_model=ConversationListResponse)
 async def list_conversations(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    List all conversations.
+    List active conversations.
+    
+    Archived conversations are not listed; their history stays readable
+    through the messages endpoints. Returns 304 when the client's ``If-None-Match`` matches the current ETag.
     """
-    conversations = db.query(Conversation).order_by(Conversation.updated_at.desc()).offset(skip).limit(limit).all()
-    total = db.query(Conversation).count()
+    # Any new, deleted or updated conversation changes the count or the newest update time
+    total, last_updated = db.query(func.count(Conversation.id), func.max(Conversation.updated_at)).one()
+    if not_modified(request, response, compute_etag(skip, limit, total, last_updated)):
+        return Response(status_code=304, headers=dict(response.headers))
     
-    return ConversationListResponse(
-        conversations=[
-            ConversationResponse(
-                id=c.id,
-                title=c.title,
-                created_at=c.created_at,
-                updated_at=c.updated_at,
-                message_count=len(c.messages)
-            )
-            for c in conversations
+    # Counted per listed conversation in SQL instead of loading every message
+    message_count = select(func.count(Message.id)).where(
+        Message.conversation_id == Conversation.id
+    ).correlate(Conversation).scalar_subquery()
+    rows = db.query(
+        Conversation.id,
+        Conversation.title,
+        Conversation.created_at,
+        Conversation.updated_at,
+        message_count
+    ).order_by(Conversation.updated_at.desc()).offset(skip).limit(limit).all()
+    
+    return json_response({
+        "conversations": [
+            {
+                "id": conversation_id,
+                "title": title,
+                "created_at": created_at,
+                "updated_at": updated_at,
+                "message_count": count
+            }
+            for conversation_id, title, created_at, updated_at, count in rows
         ],
-        total=total
-    )
+        "total": total
+    }, response)
 
 
 @router.delete("/conversations/{conversation_id}")
@@ -261,49 +610,94 @@ async def delete_conversation(
     db: Session = Depends(get_db)
 ):
     """
-    Delete a conversation.
+    Delete a conversation, whether it is still active or archived.
     """
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
-    if not conversation:
+    conversation = db.get(Conversation, conversation_id)
+    archived = db.get(ArchivedConversation, conversation_id)
+    if not conversation and not archived:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
-    # Remove chain from memory
-    if conversation_id in conversation_chains:
-        del conversation_chains[conversation_id]
-    
-    db.delete(conversation)
+    delete_conversations(db, [conversation_id])
+    if archived:
+        db.delete(archived)
     db.commit()
+    await run_in_threadpool(mark_written, conversation_id)
     
     return {"status": "deleted"}
 
 
 @router.get("/search")
-async def search_documents(query: str, k: int = 5):
+async def search_documents(
+    query: str,
+    k: int = 5,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+):
     """
-    Search for similar documents.
+    Search for similar documents, optionally restricted to a category or source file.
     """
-    results = similarity_search(query, k=k)
+    filters = {"category": category, "source_name": source}
+    results = await run_in_threadpool(similarity_search, query, k, filters)
     
-    return {
+    return FastJSONResponse({
         "query": query,
         "results": [
             {
                 "content": doc.page_content,
-                "source": doc.metadata.get("source", "unknown")
+                "source": doc.metadata.get("source", "unknown"),
+                "category": doc.metadata.get("category"),
+                "merged_sources": doc.metadata.get("merged_sources")
             }
             for doc in results
         ]
-    }
+    })
 
 
-@router.get("/health")
-async def health_check():
+@router.get("/guided/flow")
+async def guided_flow(request: Request, response: Response):
     """
-    Health check endpoint.
+    Get the compiled guided-flow graph.
+    
+    Returns 304 when the client's ``If-None-Match`` matches the flow version.
     """
-    stats = get_collection_stats()
-    return {
-        "status": "healthy",
-        "vectorstore_documents": stats.get("document_count", 0)
-    }
+    flow = get_guided_flow()
+    if not_modified(request, response, compute_etag(flow["version"])):
+        return Response(status_code=304, headers=dict(response.headers))
+    return flow
+
+
+@router.get("/guided/questions", response_model=List[GuidedQuestion])
+async def guided_questions():
+    """
+    List the guided-flow question catalog.
+    """
+    return list_guided_questions()
+
+
+@router.get("/guided/answers/{key}", response_model=GuidedAnswerResponse)
+async def guided_answer(key: str):
+    """
+    Get the precomputed answer for a guided-flow question.
+    """
+    answer = get_guided_answer(key)
+    if answer is None:
+        raise HTTPException(status_code=404, detail="Guided answer not available")
+    return answer
+
+
+@router.post("/guided/precompute")
+async def guided_precompute(background_tasks: BackgroundTasks):
+    """
+    Recompute guided-flow answers for the current index in the background.
+    """
+    background_tasks.add_task(precompute_guided_answers)
+    return {"status": "scheduled"}
+
+
+@router.get("/llm/stats")
+async def llm_stats():
+    """
+    LLM deadline, hedge and fallback counters.
+    """
+    return get_llm_stats()
 
@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from backend.core.health import get_health
+
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health_check():
+    """
+    Health check endpoint, served from the periodically refreshed report.
+    """
+    report = get_health()
+    status_code = 503 if report["status"] == "unhealthy" else 200
+    return JSONResponse(status_code=status_code, content=report)
+
+
+@router.get("/health/live")
+async def liveness():
+    """
+    Liveness probe: answers as long as the event loop is running.
+    """
+    return {"status": "alive"}
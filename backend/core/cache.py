@@ -0,0 +1,212 @@
+"""
+Pluggable cache backends for state shared between workers.
+
+- ``memory``: in-process LRU with TTLs (single worker, or per-worker caches)
+- ``sqlite``: a SQLite file shared by all workers on one host
+- ``redis``: any Redis-protocol server, shared by all hosts
+
+Values must be JSON-serializable so every backend stores the same data.
+"""
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+from backend.core.config import settings
+
+
+class CacheBackend(ABC):
+    """Interface implemented by every cache backend."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached value, or None when missing or expired.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key.
+            value: JSON-serializable value.
+            ttl: Seconds until the entry expires; never when None.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InProcessCache(CacheBackend):
+    """LRU cache held in the memory of the current process."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """Cache in a SQLite file, shared by the worker processes of one host."""
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        # Writes come from threadpool threads: the eviction counter is shared between
+        # them and eviction runs in one thread at a time (connections are per thread)
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, stored_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl if ttl else None, now)
+            )
+        with self._writes_lock:
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the oldest ones beyond ``max_entries``."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache")
+
+
+class RedisCache(CacheBackend):
+    """Cache on a Redis-protocol server, shared by every worker and host."""
+
+    def __init__(self, url: str = None, client=None, prefix: str = ""):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("The redis cache backend requires the 'redis' package")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+@lru_cache(maxsize=1)
+def get_cache() -> CacheBackend:
+    """
+    Get the configured shared cache backend.
+
+    Returns:
+        The cache backend instance.
+
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+    if settings.cache_backend == "memory":
+        return InProcessCache(max_entries=settings.cache_max_entries)
+    if settings.cache_backend == "sqlite":
+        return SQLiteCache(settings.cache_sqlite_path, max_entries=settings.cache_max_entries)
+    if settings.cache_backend == "redis":
+        return RedisCache(settings.cache_redis_url, prefix=f"{settings.cache_namespace}:")
+    raise ValueError(f"Unsupported cache backend: {settings.cache_backend}")
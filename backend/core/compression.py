@@ -0,0 +1,115 @@
+"""
+Response compression.
+
+Responses above a size threshold are compressed with Brotli when the client
+accepts it and the optional ``brotli`` package is installed, and with gzip
+otherwise. Only complete, single-message bodies (JSON and static files) are
+compressed; streamed responses such as the SSE chat stream pass through
+untouched so tokens are never held back by a compressor.
+"""
+import gzip
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bodies larger than this are compressed in the threadpool instead of on the event loop
+THREAD_MINIMUM_SIZE = 256 * 1024
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """
+    Pick the best supported content encoding accepted by the client.
+
+    Args:
+        accept_encoding: Value of the ``Accept-Encoding`` request header.
+
+    Returns:
+        ``"br"``, ``"gzip"``, or an empty string for no compression.
+    """
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if not part.strip().endswith(";q=0")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return ""
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies above ``minimum_size`` bytes."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message = {}
+        decided = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, decided
+
+            if decided:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                # Already encoded or partial responses are sent as they are
+                if "content-encoding" in headers or message["status"] == 206:
+                    decided = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            decided = True
+            body = message.get("body", b"")
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= THREAD_MINIMUM_SIZE:
+                compressed = await run_in_threadpool(compress, body, encoding, self.gzip_level, self.brotli_quality)
+            else:
+                compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
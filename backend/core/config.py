@@ -12,22 +12,110 @@ class Settings(BaseSettings):
     
     # Database Settings
     database_url: str = os.getenv("DATABASE_URL", "")
+    # Run schema creation at startup instead of `python -m backend.db.migrate`
+    db_auto_migrate: bool = False
+    # Read-only endpoints are spread over these replicas
+    database_replica_urls: List[str] = []
+    # Seconds a writer keeps reading from the primary (should exceed replica lag)
+    replica_stickiness_seconds: float = 5.0
+    # Message retention: partitions created ahead, and when conversations go cold
+    message_partition_months_ahead: int = 3
+    archive_after_days: int = 90
+    archive_batch_size: int = 500
     
     # LLM Settings
     llm_provider: str = "openai"
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
+    # Chat completions go to any OpenAI-compatible server, e.g. backend.core.fake_llm_server
+    openai_base_url: str = "https://api.openai.com/v1"
     model_name: str = "gpt-3.5-turbo"
     temperature: float = 0.7
     max_tokens: int = 1000
+    ollama_base_url: str = "http://localhost:11434"
+    local_llm_latency_ms: float = 0.0
+    
+    # LLM Tail Latency Settings
+    llm_deadline_seconds: float = 30.0
+    llm_hedge_enabled: bool = True
+    llm_hedge_delay_seconds: float = 3.0  # used until enough latencies are observed
+    llm_hedge_percentile: float = 0.95
+    llm_fallbacks: List[str] = []  # "provider:model" specs tried in order
+    llm_max_workers: int = 32  # threads for sync hedged and fallback attempts
+    
+    # LLM HTTP Client Settings (shared keep-alive pool)
+    llm_timeout: float = 60.0
+    llm_connect_timeout: float = 5.0
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry: float = 30.0
     
     # ChromaDB Settings
     chroma_db_path: str = "./chroma_db"
     chroma_collection_name: str = "documents"
+    # Index generations kept after a rebuild (the active one and its predecessor)
+    index_generations_kept: int = 2
+    
+    # Embedding Settings
+    embedding_provider: str = "openai"  # "openai" or "local" (deterministic offline stand-in)
+    local_embedding_size: int = 256
+    
+    # Query Embedding Batching
+    embedding_batch_enabled: bool = True
+    embedding_batch_window_ms: float = 5.0
+    embedding_batch_max_size: int = 32
     
     # Document Settings
     documents_path: str = "./data/documents"
     chunk_size: int = 500
     chunk_overlap: int = 100
+    # "structure" splits at headings, paragraphs and CSV rows; "recursive" by characters
+    text_splitter: str = "structure"
+    # Drop duplicate chunks; near duplicates differ in at most this many SimHash bits (0-15)
+    # and must state the same figures (fees, dates, percentages)
+    dedup_enabled: bool = True
+    dedup_simhash_distance: int = 3
+    
+    # PDF Extraction Settings (0 workers means one per CPU)
+    pdf_cache_path: str = "./pdf_cache.sqlite3"
+    pdf_cache_max_entries: int = 100000
+    pdf_extraction_workers: int = 0
+    pdf_parallel_min_pages: int = 8
+    
+    # Shared Cache Settings (memory, sqlite or redis)
+    cache_backend: str = "memory"
+    cache_sqlite_path: str = "./cache.sqlite3"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_namespace: str = "rag"
+    cache_max_entries: int = 10000
+    # Off by default: with a non-zero temperature, cached answers make repeated questions return the same text
+    answer_cache_enabled: bool = False
+    embedding_cache_enabled: bool = True
+    answer_cache_ttl: float = 3600.0
+    embedding_cache_ttl: float = 86400.0
+    
+    # Response Compression Settings (brotli needs the optional 'brotli' package)
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    
+    # Serve the static web client at /app
+    web_client_enabled: bool = True
+    
+    # Guided Flow Settings
+    # Relative to the project root
+    guided_flow_path: str = "./data/guided_flow.json"
+    
+    # Health Check Settings
+    health_refresh_interval: float = 15.0
+    health_check_timeout: float = 2.0
+    warm_up_retry_initial_seconds: float = 1.0  # doubled after every failed warm-up
+    warm_up_retry_max_seconds: float = 30.0
+    
+    # Profiling Settings (disabled unless a token is set)
+    profiling_token: str = ""
+    profiling_interval_ms: float = 1.0
+    profiling_top_allocations: int = 25
+    profile_output_dir: str = "./profiles"
     
     # CORS Settings
     cors_origins: List[str] = ["http://localhost:3000", "http://localhost:8000"]
@@ -0,0 +1,143 @@
+"""
+Deterministic OpenAI-compatible LLM server for offline load tests.
+
+Answers come from :class:`LocalChatModel`, so they are the same as with the
+in-process ``local`` provider, but requests go over HTTP. Pointing the
+``openai`` or ``ollama`` provider at this server exercises the shared
+keep-alive pool, timeouts and streaming path exactly as against a real
+provider:
+
+    python -m backend.core.fake_llm_server --port 11434 --latency-ms 200
+    LLM_PROVIDER=ollama OLLAMA_BASE_URL=http://localhost:11434
+    # or LLM_PROVIDER=openai OPENAI_BASE_URL=http://localhost:11434/v1
+
+Served endpoints: ``POST /v1/chat/completions`` (plain and streamed),
+``GET /v1/models`` and ``GET /api/tags`` (the health check probes).
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, List
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from langchain_core.messages import HumanMessage
+from backend.core.local_llm import LocalChatModel
+
+
+def create_app(latency_ms: float = 0.0, token_delay_ms: float = 0.0) -> FastAPI:
+    """
+    Create the fake server.
+
+    Args:
+        latency_ms: Delay before the answer (or its first token) is sent.
+        token_delay_ms: Delay between streamed tokens.
+
+    Returns:
+        The ASGI application.
+    """
+    app = FastAPI(title="Fake LLM server")
+    model = LocalChatModel()
+
+    def answer(messages: List[Dict]) -> str:
+        content = messages[-1].get("content", "") if messages else ""
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        return model._respond([HumanMessage(content=content)])
+
+    def usage(messages: List[Dict], text: str) -> Dict:
+        prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in messages)
+        completion_tokens = len(text.split())
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "local"}]}
+
+    @app.get("/api/tags")
+    async def list_tags():
+        return {"models": [{"name": "fake"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        text = answer(messages)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model_name = body.get("model", "fake")
+
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model_name,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage(messages, text),
+            }
+
+        def chunk(delta: Dict, finish_reason=None, **extra) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model_name,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events():
+            words = text.split(" ")
+            for index, word in enumerate(words):
+                if index and token_delay_ms:
+                    await asyncio.sleep(token_delay_ms / 1000)
+                content = word if index == len(words) - 1 else f"{word} "
+                delta = {"role": "assistant", "content": content} if index == 0 else {"content": content}
+                yield chunk(delta)
+            yield chunk({}, "stop")
+            if (body.get("stream_options") or {}).get("include_usage"):
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model_name,
+                    "choices": [],
+                    "usage": usage(messages, text),
+                }
+                yield f"data: {json.dumps(payload)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the deterministic OpenAI-compatible LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before each answer")
+    parser.add_argument("--token-delay-ms", type=float, default=0.0, help="Delay between streamed tokens")
+    args = parser.parse_args(argv)
+
+    uvicorn.run(create_app(args.latency_ms, args.token_delay_ms), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Cached component health.
+
+Probes must be cheap, so the database, vector store and LLM provider are
+checked by a background refresher and the probe endpoints only read the
+last result.
+"""
+import time
+from typing import Callable, Dict
+from sqlalchemy import text
+from backend.core.config import settings
+from backend.core.llm import get_http_client
+from backend.db.session import engine
+from backend.rag.retriever import get_collection_stats
+
+
+# Endpoint probed to check that each LLM provider is reachable
+LLM_HEALTH_URLS = {
+    "openai": "{openai_base_url}/models",
+    "ollama": "{ollama_base_url}/api/tags",
+}
+
+# Components that must be up for the app to receive traffic
+REQUIRED_COMPONENTS = ("database", "vectorstore")
+
+# Last health report, replaced as a whole by refresh_health()
+_report: Dict = {
+    "status": "starting",
+    "checked_at": None,
+    "vectorstore_documents": 0,
+    "components": {},
+}
+
+
+def check_database() -> Dict:
+    pool = engine.pool
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    
+    details = {"pool": pool.status()}
+    if hasattr(pool, "checkedout"):
+        details.update({
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    return details
+
+
+def check_vectorstore() -> Dict:
+    return get_collection_stats()
+
+
+def check_llm() -> Dict:
+    url = LLM_HEALTH_URLS.get(settings.llm_provider)
+    if url is None:
+        return {"provider": settings.llm_provider}
+    
+    # The API key is only ever sent to OpenAI, never to a self-hosted endpoint
+    headers = {}
+    if settings.llm_provider == "openai":
+        headers["Authorization"] = f"Bearer {settings.openai_api_key}"
+
+    response = get_http_client().get(
+        url.format(
+            openai_base_url=settings.openai_base_url.rstrip("/"),
+            ollama_base_url=settings.ollama_base_url.rstrip("/"),
+        ),
+        headers=headers,
+        timeout=settings.health_check_timeout,
+    )
+    # Only a successful response counts: 401 means a revoked key, 5xx a broken upstream
+    return {
+        "status": "up" if response.is_success else "down",
+        "provider": settings.llm_provider,
+        "http_status": response.status_code,
+    }
+
+
+HEALTH_CHECKS: Dict[str, Callable[[], Dict]] = {
+    "database": check_database,
+    "vectorstore": check_vectorstore,
+    "llm": check_llm,
+}
+
+
+def run_check(check: Callable[[], Dict]) -> Dict:
+    """Run a check; it is up unless it raises or reports its own status."""
+    start = time.perf_counter()
+    try:
+        result = {"status": "up", **check()}
+    except Exception as e:
+        result = {"status": "down", "error": str(e)}
+    result["latency_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def refresh_health() -> Dict:
+    """
+    Run every component check and cache the report.
+    
+    Returns:
+        The new health report.
+    """
+    global _report
+    
+    components = {name: run_check(check) for name, check in HEALTH_CHECKS.items()}
+    
+    if any(components[name]["status"] != "up" for name in REQUIRED_COMPONENTS):
+        status = "unhealthy"
+    elif any(component["status"] != "up" for component in components.values()):
+        status = "degraded"
+    else:
+        status = "healthy"
+    
+    _report = {
+        "status": status,
+        "checked_at": time.time(),
+        "vectorstore_documents": components["vectorstore"].get("document_count", 0),
+        "components": components,
+    }
+    return _report
+
+
+def get_health() -> Dict:
+    """
+    Get the cached health report, including its age.
+    
+    Returns:
+        The last health report.
+    """
+    report = dict(_report)
+    if report["checked_at"] is not None:
+        report["age_seconds"] = time.time() - report["checked_at"]
+    return report
+
+
+def is_healthy() -> bool:
+    """
+    Whether the required components were up at the last refresh.
+    """
+    components = _report["components"]
+    return all(components.get(name, {}).get("status") == "up" for name in REQUIRED_COMPONENTS)
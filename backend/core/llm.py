@@ -1,18 +1,161 @@
-from langchain_openai import ChatOpenAI
+import importlib.util
+from functools import lru_cache
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
 from backend.core.config import settings
+from backend.core.local_llm import LocalChatModel
+from backend.core.metrics import metrics_callback
+from backend.core.resilience import ResilientChatModel
 
 
-def get_llm() -> any:
+def _client_options() -> dict:
     """
-    Get the LLM instance based on the configured provider.
-    
+    Connection pool and timeout options shared by the sync and async HTTP clients.
+    """
+    return {
+        "http2": importlib.util.find_spec("h2") is not None,
+        "timeout": httpx.Timeout(settings.llm_timeout, connect=settings.llm_connect_timeout),
+        "limits": httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_expiry,
+        ),
+    }
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Get the shared, pooled HTTP client used for provider calls.
+
     Returns:
-        An LLM instance.
+        A keep-alive httpx client (HTTP/2 when the h2 package is installed).
     """
-    
+    return httpx.Client(**_client_options())
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared, pooled async HTTP client used for provider calls.
+
+    Returns:
+        A keep-alive async httpx client (HTTP/2 when the h2 package is installed).
+    """
+    return httpx.AsyncClient(**_client_options())
+
+
+async def close_http_clients() -> None:
+    """
+    Close the shared HTTP clients and drop the LLMs bound to them (called on shutdown).
+    """
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+    if get_async_http_client.cache_info().currsize:
+        await get_async_http_client().aclose()
+
+    get_resilient_llm.cache_clear()
+    create_llm.cache_clear()
+    get_http_client.cache_clear()
+    get_async_http_client.cache_clear()
+
+
+def _openai_llm(model_name: str) -> BaseChatModel:
+    # Provider SDKs are imported on first use; they dominate import time
+    from langchain_openai import ChatOpenAI
+
     return ChatOpenAI(
         api_key=settings.openai_api_key,
-        model_name=settings.model_name,
+        base_url=settings.openai_base_url,
+        model_name=model_name,
+        temperature=settings.temperature,
+        max_tokens=settings.max_tokens,
+        stream_usage=True,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client()
+    )
+
+
+def _ollama_llm(model_name: str) -> BaseChatModel:
+    # Ollama serves an OpenAI-compatible API, so the same pooled clients are reused
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        api_key="ollama",
+        base_url=f"{settings.ollama_base_url.rstrip('/')}/v1",
+        model_name=model_name,
         temperature=settings.temperature,
-        max_tokens=settings.max_tokens
+        max_tokens=settings.max_tokens,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client()
+    )
+
+
+def _local_llm(model_name: str) -> BaseChatModel:
+    return LocalChatModel(latency_ms=settings.local_llm_latency_ms)
+
+
+# Provider name -> factory taking a model name
+LLM_PROVIDERS = {
+    "openai": _openai_llm,
+    "ollama": _ollama_llm,
+    "local": _local_llm,
+}
+
+
+@lru_cache(maxsize=None)
+def create_llm(provider: str, model_name: str) -> BaseChatModel:
+    """
+    Create (once) the LLM for a provider and model.
+
+    Args:
+        provider: Registered provider name.
+        model_name: Model to use with the provider.
+
+    Returns:
+        A shared LLM instance.
+
+    Raises:
+        ValueError: If the provider is not registered.
+    """
+    factory = LLM_PROVIDERS.get(provider)
+    if factory is None:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    return factory(model_name)
+
+
+def parse_model_spec(spec: str) -> tuple:
+    """
+    Split a ``provider:model`` fallback spec; the model defaults to the configured one.
+    """
+    provider, _, model_name = spec.partition(":")
+    return provider, model_name or settings.model_name
+
+
+@lru_cache(maxsize=1)
+def get_resilient_llm() -> BaseChatModel:
+    """
+    Wrap the configured LLM with a deadline, hedged requests and ordered fallbacks.
+
+    Returns:
+        The shared resilient LLM instance.
+    """
+    return ResilientChatModel(
+        primary=create_llm(settings.llm_provider, settings.model_name),
+        fallbacks=[create_llm(*parse_model_spec(spec)) for spec in settings.llm_fallbacks],
+        deadline=settings.llm_deadline_seconds,
+        hedge_enabled=settings.llm_hedge_enabled,
+        hedge_delay=settings.llm_hedge_delay_seconds,
+        hedge_percentile=settings.llm_hedge_percentile,
+        callbacks=[metrics_callback]
     )
+
+
+def get_llm() -> BaseChatModel:
+    """
+    Get the LLM instance based on the configured provider.
+
+    Returns:
+        An LLM instance.
+    """
+    return get_resilient_llm()
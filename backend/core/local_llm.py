@@ -0,0 +1,70 @@
+"""
+Deterministic local chat model.
+
+Stands in for a hosted LLM when running offline, in load tests and
+benchmarks. The answer is derived from the retrieved context in the prompt,
+so the same prompt always produces the same answer.
+"""
+import time
+from typing import Any, Iterator, List, Optional
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from backend.core.prompts import NO_INFORMATION_ANSWER
+
+
+class LocalChatModel(BaseChatModel):
+    """Offline chat model that answers with the first sentences of the prompt context."""
+
+    latency_ms: float = 0.0
+    max_answer_chars: int = 400
+
+    @property
+    def _llm_type(self) -> str:
+        return "local"
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        prompt = str(messages[-1].content) if messages else ""
+
+        context = ""
+        if "Context:" in prompt:
+            context = prompt.split("Context:", 1)[1].split("User Question:", 1)[0]
+        context = " ".join(context.split())
+
+        if not context or context == "NO_RELEVANT_CONTEXT":
+            return NO_INFORMATION_ANSWER
+
+        answer = context[:self.max_answer_chars]
+        if "." in answer:
+            answer = answer[:answer.rindex(".") + 1]
+        return answer
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        message = AIMessage(content=self._respond(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        words = self._respond(messages).split(" ")
+        for index, word in enumerate(words):
+            text = word if index == len(words) - 1 else f"{word} "
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
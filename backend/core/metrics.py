@@ -0,0 +1,203 @@
+"""
+Latency instrumentation and Prometheus metrics.
+
+Exposes request timing, per-stage spans for the RAG pipeline, LLM
+time-to-first-token, token counts and cache hit counters.
+"""
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Buckets tuned for RAG latencies: sub-millisecond lookups up to slow LLM calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+STAGE_LATENCY = Histogram(
+    "rag_stage_duration_seconds",
+    "Latency of each stage of the chat pipeline",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time from LLM call start to the first streamed token",
+    buckets=LATENCY_BUCKETS,
+)
+
+LLM_LATENCY = Histogram(
+    "llm_duration_seconds",
+    "Total LLM call latency",
+    buckets=LATENCY_BUCKETS,
+)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens consumed by LLM calls",
+    ["type"],
+)
+
+LLM_EVENTS = Counter(
+    "llm_events_total",
+    "LLM deadline, hedge and fallback events",
+    ["event"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache and request-coalescing lookups",
+    ["cache", "result"],
+)
+
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds",
+    "Seconds from process import until the app started serving and until it was ready",
+    ["phase"],
+)
+
+EMBEDDING_BATCH_SIZE = Histogram(
+    "embedding_batch_size",
+    "Number of queries embedded per batch call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+
+@contextmanager
+def track_stage(stage: str):
+    """
+    Time a block of code as one stage of the chat pipeline.
+
+    Args:
+        stage: Stage name used as the metric label.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """
+    Count a cache lookup.
+
+    Args:
+        cache: Name of the cache.
+        hit: Whether the lookup was served from the cache.
+    """
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """LangChain callback recording LLM latency, time-to-first-token and token usage."""
+
+    def __init__(self):
+        self._starts: Dict[UUID, float] = {}
+        self._first_token_seen: set = set()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        if run_id in self._starts and run_id not in self._first_token_seen:
+            self._first_token_seen.add(run_id)
+            LLM_TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - self._starts[run_id])
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        start = self._starts.pop(run_id, None)
+        self._first_token_seen.discard(run_id)
+        if start is not None:
+            LLM_LATENCY.observe(time.perf_counter() - start)
+
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    LLM_TOKENS.labels(type="input").inc(usage.get("input_tokens", 0))
+                    LLM_TOKENS.labels(type="output").inc(usage.get("output_tokens", 0))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts.pop(run_id, None)
+        self._first_token_seen.discard(run_id)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Route template of a handled request, including any router prefix.
+
+    Args:
+        scope: ASGI scope after the app has handled the request.
+
+    Returns:
+        The template, e.g. ``/api/v1/conversations/{conversation_id}``, or
+        ``"unmatched"`` when no route matched.
+    """
+    # FastAPI includes routers lazily; the matched route's own path then lacks the prefix
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    if context is not None:
+        return context.path
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+class RequestLatencyMiddleware:
+    """
+    ASGI middleware recording the latency of every request, labelled by route template.
+
+    The timer stops when the last body message is sent, so streamed responses
+    are measured to their end rather than to their first byte. Requests that
+    fail or are cut off before completing are recorded when they end.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            recorded = True
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=route_template(scope),
+                status=status,
+            ).observe(time.perf_counter() - start)
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not recorded:
+                record()
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            if not recorded:
+                record()
+
+
+metrics_callback = MetricsCallbackHandler()
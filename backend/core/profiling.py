@@ -0,0 +1,225 @@
+"""
+Opt-in per-request profiling.
+
+A request carrying the admin profiling token (in the ``X-Profile-Token``
+header only, so it never reaches access logs) is run under a sampling CPU
+profiler and an allocation tracer. The artifact is written to disk and can
+be fetched by its ID. When no profiling token is configured the middleware
+is not installed at all, so there is no per-request cost.
+
+Profiles are process-wide: the sampler walks the stacks of every thread, so
+work pushed to the threadpool (retrieval, LLM calls, ingestion) is captured,
+and tracemalloc traces every allocation. Requests served concurrently are
+therefore included too. Each artifact records the largest number of other
+requests in flight while it was taken (``concurrent_requests``); profile on
+an otherwise idle worker for a clean single-request profile.
+"""
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from typing import Dict
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from backend.core.config import settings
+
+
+PROFILE_HEADER = "x-profile"
+PROFILE_TOKEN_HEADER = "x-profile-token"
+
+# tracemalloc is process-wide, so only one request is profiled at a time
+_profile_lock = threading.Lock()
+
+
+class StackSampler:
+    """Sampling profiler aggregating the stacks of all threads into collapsed-stack counts."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+            time.sleep(self.interval)
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format understood by flamegraph tools."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+def is_profiling_token(token: str | None) -> bool:
+    """
+    Whether a token is the configured admin profiling token (compared in constant time).
+    """
+    if not settings.profiling_token or not token:
+        return False
+    return secrets.compare_digest(token.encode("utf-8"), settings.profiling_token.encode("utf-8"))
+
+
+def wants_profile(request: Request) -> bool:
+    """
+    Whether the request asked for profiling with a valid admin token.
+    """
+    requested = request.headers.get(PROFILE_HEADER) == "1" or request.query_params.get("profile") == "1"
+    return requested and is_profiling_token(request.headers.get(PROFILE_TOKEN_HEADER))
+
+
+def get_profile_path(profile_id: str) -> str:
+    return os.path.join(settings.profile_output_dir, f"{profile_id}.json")
+
+
+class RequestProfile:
+    """Profiling session for a single request."""
+
+    def __init__(self, request: Request):
+        self.id = uuid.uuid4().hex
+        self.method = request.method
+        self.path = request.url.path
+        self._sampler = StackSampler(settings.profiling_interval_ms / 1000)
+        self._started_tracing = False
+        self._start = 0.0
+        # Most other requests in flight at once while profiling, updated by the middleware
+        self.concurrent_requests = 0
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self._started_tracing = True
+        self._start = time.perf_counter()
+        self._sampler.start()
+
+    def finish(self) -> str:
+        """
+        Stop profiling and write the artifact.
+
+        Returns:
+            Path of the written profile.
+        """
+        self._sampler.stop()
+        duration = time.perf_counter() - self._start
+
+        # The sampler's own bookkeeping is not part of the request
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        _, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        allocations = [
+            {
+                "location": str(stat.traceback[0]),
+                "size_kb": stat.size / 1024,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:settings.profiling_top_allocations]
+        ]
+
+        artifact: Dict = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "duration_seconds": duration,
+            "samples": self._sampler.sample_count,
+            "sample_interval_ms": settings.profiling_interval_ms,
+            "peak_traced_memory_kb": peak / 1024,
+            "scope": "process",
+            "concurrent_requests": self.concurrent_requests,
+            "top_allocations": allocations,
+            "collapsed_stacks": self._sampler.collapsed(),
+        }
+
+        os.makedirs(settings.profile_output_dir, exist_ok=True)
+        path = get_profile_path(self.id)
+        with open(path, "w") as f:
+            json.dump(artifact, f)
+        return path
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that opt in with the profiling header and admin token.
+
+    The profile ID is returned in the ``X-Profile-Id`` header; for streaming
+    responses the profile covers the full body. Profiling stops and the lock
+    is released however the request ends, including client disconnects.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._in_flight = 0
+        self._profile: RequestProfile | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not wants_profile(Request(scope)):
+            await self._track(scope, receive, send)
+            return
+
+        if not _profile_lock.acquire(blocking=False):
+            await self._track(scope, receive, self._with_header(send, "X-Profile-Status", "busy"))
+            return
+
+        try:
+            profile = RequestProfile(Request(scope))
+            profile.start()
+            profile.concurrent_requests = self._in_flight
+            self._profile = profile
+            try:
+                await self.app(scope, receive, self._with_header(send, "X-Profile-Id", profile.id))
+            finally:
+                self._profile = None
+                # Writing the artifact is blocking file I/O
+                await run_in_threadpool(profile.finish)
+        finally:
+            _profile_lock.release()
+
+    async def _track(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run an unprofiled request, noting it in the running profile."""
+        self._in_flight += 1
+        if self._profile is not None:
+            self._profile.concurrent_requests = max(self._profile.concurrent_requests, self._in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    @staticmethod
+    def _with_header(send: Send, name: str, value: str) -> Send:
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[name] = value
+            await send(message)
+        return send_with_header
@@ -1,6 +1,10 @@
 from langchain_core.prompts import PromptTemplate
 
 
+# Fixed answer used when retrieval finds nothing relevant
+NO_INFORMATION_ANSWER = "I don’t have this information right now... maybe in future I can help you better."
+
+
 # System prompt for the chatbot
 SYSTEM_PROMPT = """
     You are a legal AI assistant for Trust Inheritance.
@@ -0,0 +1,368 @@
+"""
+Tail-latency protection for LLM calls.
+
+Wraps the configured chat model with a per-request deadline, hedged requests
+(a second attempt fired once the first is slower than the observed p95) and
+an ordered list of fallback models tried when the primary fails or times out.
+The deadline covers the whole request: fallbacks and the rest of a stream
+only get the time that is left of it.
+
+Async calls and streams use the models' own async and streaming paths, so
+they hold no worker thread; only sync hedged and fallback attempts run on the
+attempt pool.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict, PrivateAttr
+from backend.core.config import settings
+from backend.core.metrics import LLM_EVENTS
+
+# Latency samples needed before the hedge delay is derived from observed latencies
+MIN_LATENCY_SAMPLES = 20
+
+# Counters reported as metrics
+LLM_STATS = {
+    "requests": 0,
+    "hedged": 0,
+    "hedge_wins": 0,
+    "fallbacks": 0,
+    "timeouts": 0,
+    "errors": 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        LLM_STATS[name] += 1
+    LLM_EVENTS.labels(event=name).inc()
+
+
+@lru_cache(maxsize=1)
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the pool running sync LLM attempts, sized by ``llm_max_workers``.
+    """
+    return ThreadPoolExecutor(max_workers=settings.llm_max_workers, thread_name_prefix="llm-attempt")
+
+
+def get_llm_stats() -> dict:
+    """
+    Get LLM resilience counters and the derived hedge and fallback rates.
+
+    Returns:
+        Dictionary of counters and rates.
+    """
+    with _stats_lock:
+        stats = dict(LLM_STATS)
+    requests = stats["requests"] or 1
+    stats["hedge_rate"] = stats["hedged"] / requests
+    stats["fallback_rate"] = stats["fallbacks"] / requests
+    return stats
+
+
+class ResilientChatModel(BaseChatModel):
+    """Chat model adding deadlines, hedged requests and fallbacks to a primary model."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    primary: BaseChatModel
+    fallbacks: List[BaseChatModel] = []
+    deadline: float = 30.0
+    hedge_enabled: bool = True
+    hedge_delay: float = 3.0
+    hedge_percentile: float = 0.95
+
+    _latencies: deque = PrivateAttr(default_factory=lambda: deque(maxlen=500))
+
+    @property
+    def _llm_type(self) -> str:
+        return f"resilient-{self.primary._llm_type}"
+
+    def current_hedge_delay(self) -> float:
+        """Delay before hedging: the observed latency percentile, or the configured default."""
+        samples = sorted(self._latencies)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return self.hedge_delay
+        return samples[min(len(samples) - 1, int(len(samples) * self.hedge_percentile))]
+
+    def _remaining(self, start: float) -> float:
+        """Time left of the request deadline that started at ``start``."""
+        return self.deadline - (time.monotonic() - start)
+
+    def _record(self, model: BaseChatModel, start: float) -> None:
+        if model is self.primary:
+            self._latencies.append(time.monotonic() - start)
+
+    def _attempt(self, model: BaseChatModel, messages, stop, **kwargs) -> ChatResult:
+        start = time.monotonic()
+        message = model.invoke(messages, stop=stop, **kwargs)
+        self._record(model, start)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _aattempt(self, model: BaseChatModel, messages, stop, **kwargs) -> ChatResult:
+        start = time.monotonic()
+        message = await model.ainvoke(messages, stop=stop, **kwargs)
+        self._record(model, start)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _hedged_call(self, messages, stop, **kwargs) -> ChatResult:
+        """Call the primary model, firing a second attempt if the first is slow."""
+        executor = get_executor()
+        start = time.monotonic()
+        first = executor.submit(self._attempt, self.primary, messages, stop, **kwargs)
+        pending = {first}
+
+        delay = self.current_hedge_delay()
+        if self.hedge_enabled and delay < self.deadline:
+            done, _ = wait(pending, timeout=delay)
+            if not done:
+                _count("hedged")
+                pending.add(executor.submit(self._attempt, self.primary, messages, stop, **kwargs))
+
+        last_error = None
+        while pending:
+            remaining = self._remaining(start)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not first:
+                        _count("hedge_wins")
+                    return future.result()
+                last_error = future.exception()
+
+        if pending:
+            # Abandoned attempts finish in the background and are ignored
+            _count("timeouts")
+            raise TimeoutError(f"LLM call exceeded its {self.deadline}s deadline")
+        raise last_error
+
+    async def _ahedged_call(self, messages, stop, **kwargs) -> ChatResult:
+        """Async :meth:`_hedged_call`; attempts still running at the deadline are cancelled."""
+        start = time.monotonic()
+        first = asyncio.ensure_future(self._aattempt(self.primary, messages, stop, **kwargs))
+        pending = {first}
+
+        delay = self.current_hedge_delay()
+        if self.hedge_enabled and delay < self.deadline:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                _count("hedged")
+                pending.add(asyncio.ensure_future(self._aattempt(self.primary, messages, stop, **kwargs)))
+
+        last_error = None
+        try:
+            while pending:
+                remaining = self._remaining(start)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            _count("hedge_wins")
+                        return task.result()
+                    last_error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending:
+            _count("timeouts")
+            raise TimeoutError(f"LLM call exceeded its {self.deadline}s deadline")
+        raise last_error
+
+    def _fallback_call(self, model: BaseChatModel, messages, stop, budget: float, **kwargs) -> ChatResult:
+        future = get_executor().submit(self._attempt, model, messages, stop, **kwargs)
+        try:
+            return future.result(timeout=budget)
+        except TimeoutError:
+            _count("timeouts")
+            raise
+
+    async def _afallback_call(self, model: BaseChatModel, messages, stop, budget: float, **kwargs) -> ChatResult:
+        try:
+            return await asyncio.wait_for(self._aattempt(model, messages, stop, **kwargs), budget)
+        except TimeoutError:
+            _count("timeouts")
+            raise
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        _count("requests")
+        start = time.monotonic()
+        try:
+            return self._hedged_call(messages, stop, **kwargs)
+        except Exception as e:
+            last_error = e
+
+        for model in self.fallbacks:
+            budget = self._remaining(start)
+            if budget <= 0:
+                break
+            _count("fallbacks")
+            try:
+                return self._fallback_call(model, messages, stop, budget, **kwargs)
+            except Exception as e:
+                last_error = e
+
+        _count("errors")
+        raise last_error
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        _count("requests")
+        start = time.monotonic()
+        try:
+            return await self._ahedged_call(messages, stop, **kwargs)
+        except Exception as e:
+            last_error = e
+
+        for model in self.fallbacks:
+            budget = self._remaining(start)
+            if budget <= 0:
+                break
+            _count("fallbacks")
+            try:
+                return await self._afallback_call(model, messages, stop, budget, **kwargs)
+            except Exception as e:
+                last_error = e
+
+        _count("errors")
+        raise last_error
+
+    def _next_chunk(self, stream: Iterator, start: float):
+        """
+        Next chunk of a sync stream, or a TimeoutError once the deadline has passed.
+
+        The stream is read in the calling thread, so a read that is already
+        blocked is bounded by the HTTP client timeout rather than the deadline.
+        """
+        if self._remaining(start) <= 0:
+            _count("timeouts")
+            raise TimeoutError(f"LLM stream exceeded its {self.deadline}s deadline")
+        return next(stream)
+
+    async def _anext_chunk(self, stream: AsyncIterator, start: float):
+        """Next chunk of an async stream, or a TimeoutError once the deadline has passed."""
+        remaining = self._remaining(start)
+        try:
+            if remaining <= 0:
+                raise TimeoutError
+            async with asyncio.timeout(remaining):
+                return await stream.__anext__()
+        except TimeoutError:
+            _count("timeouts")
+            raise TimeoutError(f"LLM stream exceeded its {self.deadline}s deadline") from None
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        _count("requests")
+        start = time.monotonic()
+        last_error = None
+
+        for index, model in enumerate([self.primary, *self.fallbacks]):
+            if index:
+                if self._remaining(start) <= 0:
+                    break
+                _count("fallbacks")
+            stream = model.stream(messages, stop=stop, **kwargs)
+
+            # Fall back only while nothing has been sent to the client yet
+            try:
+                chunk = self._next_chunk(stream, start)
+            except StopIteration:
+                return
+            except Exception as e:
+                last_error = e
+                stream.close()
+                continue
+
+            try:
+                while True:
+                    generation = ChatGenerationChunk(message=chunk)
+                    if run_manager:
+                        run_manager.on_llm_new_token(generation.text, chunk=generation)
+                    yield generation
+                    try:
+                        chunk = self._next_chunk(stream, start)
+                    except StopIteration:
+                        return
+            finally:
+                # Also runs when the consumer stops early, releasing the model's connection
+                stream.close()
+
+        _count("errors")
+        raise last_error
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        _count("requests")
+        start = time.monotonic()
+        last_error = None
+
+        for index, model in enumerate([self.primary, *self.fallbacks]):
+            if index:
+                if self._remaining(start) <= 0:
+                    break
+                _count("fallbacks")
+            stream = model.astream(messages, stop=stop, **kwargs)
+
+            # Fall back only while nothing has been sent to the client yet
+            try:
+                chunk = await self._anext_chunk(stream, start)
+            except StopAsyncIteration:
+                return
+            except Exception as e:
+                last_error = e
+                await stream.aclose()
+                continue
+
+            try:
+                while True:
+                    generation = ChatGenerationChunk(message=chunk)
+                    if run_manager:
+                        await run_manager.on_llm_new_token(generation.text, chunk=generation)
+                    yield generation
+                    try:
+                        chunk = await self._anext_chunk(stream, start)
+                    except StopAsyncIteration:
+                        return
+            finally:
+                await stream.aclose()
+
+        _count("errors")
+        raise last_error
@@ -0,0 +1,19 @@
+"""
+Fast JSON responses.
+
+Responses are rendered with orjson, which serializes lists of plain dicts,
+datetimes and numbers several times faster than the standard library. Large
+list endpoints build plain dicts and return this response directly, so no
+intermediate Pydantic object is created per item.
+"""
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        # UTC datetimes end in "Z", matching Pydantic's own serialization
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
@@ -0,0 +1,179 @@
+"""
+Archival of cold conversations.
+
+Conversations idle for ``ARCHIVE_AFTER_DAYS`` are moved out of the hot
+``conversations``/``messages`` tables into ``archived_conversations``, one
+gzip-compressed JSON document per conversation. Archived conversations are
+read-only: they no longer appear in ``/conversations``, their history stays
+readable through the messages endpoints, and sending a message to one
+returns 409. Run it periodically:
+
+    python -m backend.db.archive
+
+All deletes are set-based (one statement per batch), and on PostgreSQL the
+monthly message partitions left empty by archival are dropped.
+"""
+import argparse
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import Dict, List, Optional
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+from backend.core.config import settings
+from backend.db.models import ArchivedConversation, Conversation, Message
+from backend.db.session import SessionLocal, engine
+
+
+def compress_messages(messages: List[Dict]) -> bytes:
+    return gzip.compress(json.dumps(messages).encode("utf-8"))
+
+
+def decompress_messages(payload: bytes) -> List[Dict]:
+    return json.loads(gzip.decompress(payload).decode("utf-8"))
+
+
+def delete_conversations(db: Session, conversation_ids: List[int]) -> None:
+    """
+    Delete conversations and their messages with one statement per table.
+    
+    Args:
+        db: Database session (committed by the caller).
+        conversation_ids: IDs of the conversations to delete.
+    """
+    if not conversation_ids:
+        return
+    db.execute(delete(Message).where(Message.conversation_id.in_(conversation_ids)))
+    db.execute(delete(Conversation).where(Conversation.id.in_(conversation_ids)))
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """
+    Archive one batch of conversations last updated before ``cutoff``.
+    
+    Returns:
+        Number of conversations archived.
+    """
+    conversations = db.execute(
+        select(Conversation.id, Conversation.title, Conversation.created_at, Conversation.updated_at)
+        .where(Conversation.updated_at < cutoff)
+        .order_by(Conversation.id)
+        .limit(batch_size)
+    ).all()
+    if not conversations:
+        return 0
+    
+    ids = [conversation.id for conversation in conversations]
+    rows = db.execute(
+        select(Message.conversation_id, Message.role, Message.content, Message.created_at)
+        .where(Message.conversation_id.in_(ids))
+        .order_by(Message.conversation_id, Message.created_at, Message.id)
+    ).all()
+    messages_by_conversation = {
+        conversation_id: [
+            {"role": row.role, "content": row.content, "created_at": row.created_at.isoformat()}
+            for row in group
+        ]
+        for conversation_id, group in groupby(rows, key=lambda row: row.conversation_id)
+    }
+    
+    db.add_all([
+        ArchivedConversation(
+            id=conversation.id,
+            title=conversation.title,
+            created_at=conversation.created_at,
+            updated_at=conversation.updated_at,
+            message_count=len(messages_by_conversation.get(conversation.id, [])),
+            messages=compress_messages(messages_by_conversation.get(conversation.id, [])),
+        )
+        for conversation in conversations
+    ])
+    delete_conversations(db, ids)
+    db.commit()
+    return len(ids)
+
+
+def drop_empty_partitions(cutoff: datetime) -> List[str]:
+    """
+    Drop monthly message partitions that ended before ``cutoff`` and are empty
+    (PostgreSQL only).
+    
+    Returns:
+        Names of the dropped partitions.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    
+    dropped = []
+    with engine.begin() as connection:
+        partitions = connection.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = 'messages' AND child.relname ~ '^messages_[0-9]{4}_[0-9]{2}$'"
+        )).scalars().all()
+        for name in partitions:
+            year, month = int(name[9:13]), int(name[14:16])
+            end = datetime(year + month // 12, month % 12 + 1, 1)
+            if end > cutoff:
+                continue
+            if connection.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first() is None:
+                connection.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+    return dropped
+
+
+def archive_cold_conversations(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> Dict:
+    """
+    Archive every conversation idle for longer than ``older_than_days``.
+    
+    Args:
+        older_than_days: Idle period; defaults to the configured value.
+        batch_size: Conversations archived per transaction.
+    
+    Returns:
+        Number of archived conversations and dropped partitions.
+    """
+    older_than_days = older_than_days or settings.archive_after_days
+    batch_size = batch_size or settings.archive_batch_size
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=older_than_days)).replace(tzinfo=None)
+    
+    archived = 0
+    db = SessionLocal()
+    try:
+        while True:
+            count = archive_batch(db, cutoff, batch_size)
+            if not count:
+                break
+            archived += count
+    finally:
+        db.close()
+    
+    dropped = drop_empty_partitions(cutoff)
+    print(f"Archived {archived} conversations, dropped {len(dropped)} message partitions")
+    return {"archived": archived, "dropped_partitions": dropped}
+
+
+def get_archived_messages(db: Session, conversation_id: int) -> Optional[List[Dict]]:
+    """
+    Get the messages of an archived conversation.
+    
+    Returns:
+        The messages, or None when the conversation is not archived.
+    """
+    archived = db.get(ArchivedConversation, conversation_id)
+    if archived is None:
+        return None
+    return decompress_messages(archived.messages)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive cold conversations.")
+    parser.add_argument("--older-than-days", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    archive_cold_conversations(args.older_than_days, args.batch_size)
@@ -0,0 +1,165 @@
+"""
+Explicit database schema migration step.
+
+Run once per deployment, before the API starts, and at least monthly so
+message partitions exist ahead of time:
+
+    python -m backend.db.migrate
+
+Keeping schema creation out of application startup means autoscaled
+replicas do not all issue DDL against the database when they boot.
+
+On PostgreSQL the ``messages`` table is created range-partitioned by month
+on ``created_at``. Each month lives in its own ``messages_YYYY_MM`` table
+with its own small indexes, and archived months are dropped whole instead
+of being deleted (and vacuumed) row by row. Other databases get the plain
+table.
+
+A plain ``messages`` table left by an earlier ``create_all`` is converted in
+place, in one transaction: it is renamed, the partitioned table is created
+with partitions covering its oldest row, the rows are copied over and the
+old table is dropped. Message IDs and their sequence are kept. The table is
+locked while rows are copied, so convert large tables in a maintenance window.
+"""
+from datetime import date
+from typing import Optional
+from sqlalchemy import text
+from backend.core.config import settings
+from backend.db import models
+from backend.db.session import Base, engine, init_db
+
+
+LEGACY_MESSAGES_TABLE = "messages_unpartitioned"
+
+PARTITIONED_MESSAGES_DDL = """
+CREATE SEQUENCE IF NOT EXISTS messages_id_seq;
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER NOT NULL DEFAULT nextval('messages_id_seq'),
+    conversation_id INTEGER NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    role VARCHAR(50),
+    content TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+ALTER SEQUENCE messages_id_seq OWNED BY messages.id
+"""
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"messages_{month.year:04d}_{month.month:02d}"
+
+
+def create_message_partitions(connection, months_ahead: int, since: Optional[date] = None) -> None:
+    """
+    Create the monthly partitions from ``since`` (the current month by default)
+    up to ``months_ahead`` months ahead, plus a default partition catching
+    anything outside them.
+    """
+    current = date.today().replace(day=1)
+    start = min(since.replace(day=1), current) if since else current
+    while start <= add_months(current, months_ahead):
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF messages "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+        ))
+        start = add_months(start, 1)
+    connection.execute(text("CREATE TABLE IF NOT EXISTS messages_default PARTITION OF messages DEFAULT"))
+
+
+def messages_state(connection) -> str:
+    """
+    Whether ``messages`` is ``"missing"``, a ``"plain"`` table or ``"partitioned"``.
+    """
+    if connection.execute(text("SELECT to_regclass('messages')")).scalar() is None:
+        return "missing"
+    partitioned = connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'messages'::regclass"
+    )).scalar()
+    return "partitioned" if partitioned else "plain"
+
+
+def detach_plain_messages(connection) -> Optional[date]:
+    """
+    Move a plain ``messages`` table out of the way of the partitioned one.
+    
+    The table and its indexes are renamed, and its ID sequence is detached
+    (and named ``messages_id_seq``) so the partitioned table continues it.
+    
+    Returns:
+        Date of the oldest message, or None when the table is empty.
+    """
+    sequence = connection.execute(text("SELECT pg_get_serial_sequence('messages', 'id')")).scalar()
+    if sequence:
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+        if sequence.split(".")[-1] != "messages_id_seq":
+            connection.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO messages_id_seq"))
+    
+    connection.execute(text(f"ALTER TABLE messages RENAME TO {LEGACY_MESSAGES_TABLE}"))
+    # Index names are unique per schema, so the old ones would clash with the new table's
+    indexes = connection.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table"
+    ), {"table": LEGACY_MESSAGES_TABLE}).scalars().all()
+    for index in indexes:
+        connection.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index[:50]}_unpartitioned"'))
+    
+    oldest = connection.execute(text(f"SELECT min(created_at) FROM {LEGACY_MESSAGES_TABLE}")).scalar()
+    return oldest.date() if oldest else None
+
+
+def copy_plain_messages(connection) -> int:
+    """
+    Copy the rows of the detached plain table into the partitions and drop it.
+    
+    Returns:
+        Number of messages copied.
+    """
+    copied = connection.execute(text(
+        "INSERT INTO messages (id, conversation_id, role, content, created_at) "
+        f"SELECT id, conversation_id, role, content, COALESCE(created_at, now()) FROM {LEGACY_MESSAGES_TABLE}"
+    )).rowcount
+    connection.execute(text(f"DROP TABLE {LEGACY_MESSAGES_TABLE}"))
+    connection.execute(text(
+        "SELECT setval('messages_id_seq', GREATEST((SELECT max(id) FROM messages), 1))"
+    ))
+    return copied
+
+
+def migrate() -> None:
+    """
+    Create any missing tables and upcoming message partitions.
+    """
+    if engine.dialect.name != "postgresql":
+        init_db()
+        return
+    
+    messages = models.Message.__table__
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[table for table in Base.metadata.sorted_tables if table is not messages]
+    )
+    with engine.begin() as connection:
+        # DDL is transactional on PostgreSQL: a failed conversion leaves the plain table intact
+        oldest = None
+        converting = messages_state(connection) == "plain"
+        if converting:
+            oldest = detach_plain_messages(connection)
+        
+        connection.execute(text(PARTITIONED_MESSAGES_DDL))
+        # Indexes created on the parent are created on every partition
+        for index in messages.indexes:
+            index.create(bind=connection, checkfirst=True)
+        create_message_partitions(connection, settings.message_partition_months_ahead, since=oldest)
+        
+        if converting:
+            copied = copy_plain_messages(connection)
+            print(f"Converted messages to a partitioned table ({copied} messages copied)")
+    print("Database initialized (messages partitioned by month)")
+
+
+if __name__ == "__main__":
+    migrate()
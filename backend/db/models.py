@@ -1,38 +1,69 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from backend.db.session import Base
 
 
+def utcnow() -> datetime:
+    """Default for timestamp columns, evaluated per row."""
+    return datetime.now(timezone.utc)
+
+
 class Conversation(Base):
     """Model for storing conversations."""
     
     __tablename__ = "conversations"
+    # Never reuse IDs on SQLite: archived conversations keep theirs
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), default="New Conversation")
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
     
-    # Relationship to messages
-    messages = relationship("Message", back_populates="conversation", cascade="all, delete")
+    # Relationship to messages (deleted by the database, not row by row)
+    messages = relationship("Message", back_populates="conversation", passive_deletes=True)
 
 
 class Message(Base):
-    """Model for storing chat messages."""
+    """Model for storing chat messages.
+    
+    On PostgreSQL the table is range-partitioned by month on ``created_at``
+    (see backend.db.migrate), so cold months can be dropped as a whole.
+    """
     
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
+    conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False)
     role = Column(String(50))  # 'user' or 'assistant'
     content = Column(Text)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     
     # Relationship to conversation
     conversation = relationship("Conversation", back_populates="messages")
 
 
+class ArchivedConversation(Base):
+    """Model for cold conversations moved out of the hot tables.
+    
+    Messages are stored as one gzip-compressed JSON document per conversation.
+    """
+    
+    __tablename__ = "archived_conversations"
+    
+    id = Column(Integer, primary_key=True)  # ID the conversation had in the hot table
+    title = Column(String(255))
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=utcnow)
+    message_count = Column(Integer, default=0)
+    messages = Column(LargeBinary, nullable=False)
+
+
 class Document(Base):
     """Model for tracking indexed documents."""
     
@@ -44,6 +75,5 @@ class Document(Base):
     file_type = Column(String(50))
     file_size = Column(Integer)
     chunk_count = Column(Integer, default=0)
-    indexed_at = Column(DateTime, default=datetime.now(timezone.utc))
+    indexed_at = Column(DateTime, default=utcnow)
     status = Column(String(50), default="pending")  # 'pending', 'indexed', 'error'
-
@@ -1,12 +1,30 @@
 """
 Database session management.
+
+Writes go to the primary. Read-only endpoints use ``get_read_db``, which
+picks a replica from ``DATABASE_REPLICA_URLS`` unless the client or the
+conversation being read was written to within the stickiness window, in
+which case the primary is used so users always see their own writes.
+
+Per-conversation stickiness is recorded in the shared cache. With the
+``memory`` cache backend it is only seen by the worker that handled the
+write, so multi-worker deployments with replicas need the ``sqlite`` or
+``redis`` backend; the client cookie works with any backend.
 """
+import logging
+import random
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from backend.core.cache import get_cache
 from backend.core.config import settings
 
 
+# Cookie set on responses to writes; while present, reads use the primary
+PRIMARY_COOKIE = "db_read_primary"
+
+
 # Get database URL from environment variables
 DATABASE_URL = settings.database_url
 
@@ -16,6 +34,19 @@ engine = create_engine(DATABASE_URL)
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replicas (empty when every query goes to the primary)
+replica_engines = [create_engine(url) for url in settings.database_replica_urls]
+ReplicaSessions = [
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    for replica_engine in replica_engines
+]
+
+if ReplicaSessions and settings.cache_backend == "memory":
+    logging.getLogger(__name__).warning(
+        "Read replicas are configured with CACHE_BACKEND=memory: conversation stickiness "
+        "only applies within one worker; use the sqlite or redis backend with several workers"
+    )
+
 
 # Create base class for models
 Base = declarative_base()
@@ -35,6 +66,65 @@ def get_db():
         db.close()
 
 
+def mark_written(conversation_id: int) -> None:
+    """
+    Route reads of a conversation to the primary until replicas have caught up.
+    
+    Args:
+        conversation_id: ID of the conversation just written to.
+    """
+    if ReplicaSessions:
+        get_cache().set(
+            f"written:conversation:{conversation_id}", True,
+            ttl=settings.replica_stickiness_seconds
+        )
+
+
+def reads_from_primary(request: Request) -> bool:
+    """
+    Whether a read must see writes that replicas may not have applied yet.
+    """
+    if request.cookies.get(PRIMARY_COOKIE):
+        return True
+    conversation_id = request.path_params.get("conversation_id")
+    if conversation_id is None:
+        return False
+    return get_cache().get(f"written:conversation:{conversation_id}") is not None
+
+
+def get_read_db(request: Request):
+    """
+    Dependency to get a session for read-only endpoints.
+    
+    Yields:
+        Session bound to a replica, or to the primary for recent writers.
+    """
+    if not ReplicaSessions or reads_from_primary(request):
+        session_factory = SessionLocal
+    else:
+        session_factory = random.choice(ReplicaSessions)
+    
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def primary_stickiness_middleware(request: Request, call_next):
+    """
+    Mark clients that just wrote so their next reads go to the primary.
+    """
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(
+            PRIMARY_COOKIE, "1",
+            max_age=max(1, int(settings.replica_stickiness_seconds)),
+            httponly=True
+        )
+    return response
+
+
 def init_db():
     """
     Initialize the database.
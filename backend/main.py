@@ -1,21 +1,106 @@
 """
 Main application entry point for the RAG Chat Bot.
 """
-from fastapi import FastAPI
+import time
+
+# Measured from here so reported startup times include module imports
+BOOT_START = time.perf_counter()
+
+import asyncio
+import logging
+import os
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.concurrency import run_in_threadpool
 from backend.api.chat import router as chat_router
-from backend.db.session import init_db
+from backend.api.admin import router as admin_router
+from backend.api.health import router as health_router
+from backend.db.migrate import migrate
+from backend.db.session import ReplicaSessions, primary_stickiness_middleware
+from backend.core.compression import CompressionMiddleware
 from backend.core.config import settings
+from backend.core.health import is_healthy, refresh_health
+from backend.core.llm import get_llm, close_http_clients
+from backend.core.metrics import STARTUP_SECONDS, RequestLatencyMiddleware
+from backend.core.profiling import ProfilingMiddleware
+from backend.core.responses import FastJSONResponse
+from backend.rag.retriever import get_vectorstore
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def warm_up() -> None:
+    """
+    Create the shared LLM clients and open the vector store.
+    """
+    get_llm()
+    get_vectorstore()
+
+
+async def refresh_health_periodically() -> None:
+    """
+    Keep the cached health report fresh so probes never do the checks themselves.
+    """
+    while True:
+        await asyncio.sleep(settings.health_refresh_interval)
+        try:
+            await run_in_threadpool(refresh_health)
+        except Exception:
+            logger.exception("Health refresh failed")
+
+
+async def run_warm_up(app: FastAPI) -> None:
+    """
+    Warm shared resources in the background and mark the app ready, retrying
+    with exponential backoff until warm-up succeeds.
+    """
+    delay = settings.warm_up_retry_initial_seconds
+    attempt = 1
+    while True:
+        try:
+            await run_in_threadpool(warm_up)
+            await run_in_threadpool(refresh_health)
+            break
+        except Exception as e:
+            logger.warning("Warm-up attempt %d failed, retrying in %.1fs: %s", attempt, delay, e)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, settings.warm_up_retry_max_seconds)
+        attempt += 1
+    
+    app.state.ready = True
+    ready_seconds = time.perf_counter() - BOOT_START
+    STARTUP_SECONDS.labels(phase="ready").set(ready_seconds)
+    logger.info("Application ready after %.2fs", ready_seconds)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
-    print(f"Application started: {settings.app_name}")
+    if settings.db_auto_migrate:
+        migrate()
+    
+    # Serve (liveness, docs) immediately; /ready flips once warm-up completes
+    app.state.ready = False
+    # The refresher runs even while warm-up is still failing, so health reports stay current
+    background_tasks = [
+        asyncio.create_task(run_warm_up(app)),
+        asyncio.create_task(refresh_health_periodically()),
+    ]
+    
+    started_seconds = time.perf_counter() - BOOT_START
+    STARTUP_SECONDS.labels(phase="started").set(started_seconds)
+    logger.info("Application started: %s in %.2fs", settings.app_name, started_seconds)
     
     yield
-    print("Application is shutting down...")
+    for task in background_tasks:
+        task.cancel()
+    await close_http_clients()
+    logger.info("Application is shutting down...")
 
 
 # Create FastAPI application
@@ -24,7 +109,16 @@ app = FastAPI(
     title=settings.app_name,
     description="A RAG-powered chat bot that answers questions based on your documents",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=FastJSONResponse
+)
+
+# Added first so it wraps the routes directly and sees complete response bodies
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
 )
 
 # Add CORS middleware
@@ -37,8 +131,31 @@ app.add_middleware(
 )
 
 
+app.add_middleware(RequestLatencyMiddleware)
+
+
+# Read-your-writes stickiness only matters when reads go to replicas
+if ReplicaSessions:
+    app.middleware("http")(primary_stickiness_middleware)
+
+
+# Per-request profiling is only wired in when an admin token is configured
+if settings.profiling_token:
+    app.add_middleware(ProfilingMiddleware)
+
+
 # Include routers
 app.include_router(chat_router, prefix="/api/v1")
+app.include_router(health_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1/admin")
+
+# Static web client: a browser-side alternative to the Streamlit frontend
+if settings.web_client_enabled:
+    app.mount(
+        "/app",
+        StaticFiles(directory=os.path.join(os.path.dirname(__file__), "static"), html=True),
+        name="web_client"
+    )
 
 
 @app.get("/")
@@ -50,7 +167,27 @@ async def root():
         "name": settings.app_name,
         "version": "1.0.0",
         "status": "running",
-        "docs_url": "/docs"
+        "docs_url": "/docs",
+        "web_client_url": "/app/" if settings.web_client_enabled else None
     }
 
 
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    """
+    Readiness probe: 200 once the vector store and LLM clients are warmed and
+    the last health refresh found the database and vector store up.
+    """
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    if not is_healthy():
+        return JSONResponse(status_code=503, content={"status": "unhealthy"})
+    return {"status": "ready"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics endpoint.
+    """
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
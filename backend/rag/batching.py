@@ -0,0 +1,98 @@
+"""
+Query embedding micro-batching for the RAG pipeline.
+
+Concurrent requests each embed a single query. Instead of one API round trip
+per query, queries arriving within a short window are collected and embedded
+with a single batch call, and each waiting caller receives its own vector.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List
+from langchain_core.embeddings import Embeddings
+from backend.core.metrics import EMBEDDING_BATCH_SIZE
+
+
+# Number of batch calls allowed in flight at the same time
+MAX_CONCURRENT_BATCHES = 4
+
+
+class BatchingEmbeddings(Embeddings):
+    """Embeddings wrapper that coalesces concurrent ``embed_query`` calls."""
+
+    def __init__(self, embeddings: Embeddings, window_ms: float = 5.0, max_batch_size: int = 32):
+        self.embeddings = embeddings
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.query_count = 0
+        self.batch_count = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_BATCHES,
+            thread_name_prefix="embedding-batch"
+        )
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Document embedding is already batched, so it is passed straight through."""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query as part of the next batch and wait for its vector."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._collect,
+                    name="embedding-batcher",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _collect(self) -> None:
+        """Gather queries for one window (or until the batch is full) and dispatch them."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._executor.submit(self._flush, batch)
+
+    def _flush(self, batch: list) -> None:
+        """Embed a batch with one call and fan the vectors back out to the callers."""
+        # Identical queries in the same window share a single embedding
+        texts = list(dict.fromkeys(text for text, _ in batch))
+
+        try:
+            vectors = self.embeddings.embed_documents(texts)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        # Batches are flushed from several threads at once
+        with self._lock:
+            self.query_count += len(batch)
+            self.batch_count += 1
+        EMBEDDING_BATCH_SIZE.observe(len(batch))
+
+        by_text = dict(zip(texts, vectors))
+        for text, future in batch:
+            future.set_result(by_text[text])
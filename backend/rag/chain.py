@@ -3,7 +3,7 @@ RAG chain component for conversational question answering.
 LangChain >= 0.2.x compatible (LCEL-native, no legacy memory).
 """
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.output_parsers import StrOutputParser
@@ -13,19 +13,43 @@ from langchain_core.runnables import (
 )
 from backend.core.llm import get_llm
 from backend.core.prompts import CONVERSATIONAL_PROMPT
-from backend.rag.retriever import get_vectorstore
+from backend.core.metrics import track_stage
+from backend.rag.retriever import get_vectorstore, build_filter
+
+
+def get_default_retriever(filters: Dict | None = None) -> BaseRetriever:
+    """
+    Build the default top-5 retriever, optionally restricted by metadata filters.
+    """
+    search_kwargs = {"k": 5}
+    where = build_filter(filters)
+    if where:
+        search_kwargs["filter"] = where
+
+    vectorstore = get_vectorstore()
+    return vectorstore.as_retriever(search_kwargs=search_kwargs)
+
+
+def build_prompt(inputs: dict):
+    """
+    Format the conversational prompt, timed as its own pipeline stage.
+    """
+    with track_stage("prompt_build"):
+        return CONVERSATIONAL_PROMPT.invoke(inputs)
 
 
 # ---------------------------------------------------------
 # Basic Retrieval Chain
 # ---------------------------------------------------------
-def create_retrieval_chain(retriever: BaseRetriever | None = None):
+def create_retrieval_chain(
+    retriever: BaseRetriever | None = None,
+    filters: Dict | None = None,
+):
     """
     Create a simple retrieval-based QA chain.
     """
     if retriever is None:
-        vectorstore = get_vectorstore()
-        retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
+        retriever = get_default_retriever(filters)
 
     llm = get_llm()
 
@@ -34,7 +58,7 @@ def create_retrieval_chain(retriever: BaseRetriever | None = None):
             "context": retriever,
             "question": RunnablePassthrough(),
         }
-        | CONVERSATIONAL_PROMPT
+        | RunnableLambda(build_prompt)
         | llm
         | StrOutputParser()
     )
@@ -45,13 +69,15 @@ def create_retrieval_chain(retriever: BaseRetriever | None = None):
 # ---------------------------------------------------------
 # RAG Chain (Non-conversational)
 # ---------------------------------------------------------
-def get_rag_chain(retriever: BaseRetriever | None = None):
+def get_rag_chain(
+    retriever: BaseRetriever | None = None,
+    filters: Dict | None = None,
+):
     """
     Get a standard RAG QA chain.
     """
     if retriever is None:
-        vectorstore = get_vectorstore()
-        retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
+        retriever = get_default_retriever(filters)
 
     llm = get_llm()
 
@@ -59,7 +85,7 @@ def get_rag_chain(retriever: BaseRetriever | None = None):
         RunnablePassthrough.assign(
             context=lambda x: retriever.invoke(x["question"])
         )
-        | CONVERSATIONAL_PROMPT
+        | RunnableLambda(build_prompt)
         | llm
         | StrOutputParser()
     )
@@ -70,26 +96,32 @@ def get_rag_chain(retriever: BaseRetriever | None = None):
 # ---------------------------------------------------------
 # Conversational RAG Chain (LCEL-correct)
 # ---------------------------------------------------------
-def get_conversational_chain(retriever: BaseRetriever | None = None):
+def get_conversational_chain(
+    retriever: BaseRetriever | None = None,
+    filters: Dict | None = None,
+):
     """
     Get a conversational RAG chain.
     Chat history is passed explicitly (LangChain 0.2+ standard).
+    Context retrieved by the caller is reused instead of searching again.
     """
     if retriever is None:
-        vectorstore = get_vectorstore()
-        retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
+        retriever = get_default_retriever(filters)
 
     llm = get_llm()
 
     def normalize_question(inputs: dict) -> str:
         return inputs["question"]
 
+    def resolve_context(inputs: dict):
+        return inputs.get("context") or retriever.invoke(inputs["question"])
+
     chain = (
         RunnablePassthrough.assign(
             question=RunnableLambda(normalize_question),
-            context=lambda x: retriever.invoke(x["question"]),
+            context=RunnableLambda(resolve_context),
         )
-        | CONVERSATIONAL_PROMPT
+        | RunnableLambda(build_prompt)
         | llm
         | StrOutputParser()
     )
@@ -102,15 +134,16 @@ def get_conversational_chain(retriever: BaseRetriever | None = None):
 # ---------------------------------------------------------
 def ask_question(
     question: str,
-    chain=None
+    chain=None,
+    filters: Dict | None = None,
 ) -> Tuple[str, List[Document]]:
     """
     Ask a single question using RAG.
     """
     if chain is None:
-        chain = get_rag_chain()
+        chain = get_rag_chain(filters=filters)
         vectorstore = get_vectorstore()
-        sources = vectorstore.similarity_search(question, k=5)
+        sources = vectorstore.similarity_search(question, k=5, filter=build_filter(filters))
     else:
         sources = []
 
@@ -0,0 +1,165 @@
+"""
+Chunk deduplication at ingestion.
+
+Legal templates repeat boilerplate clauses across documents, and chunk
+overlap repeats text further. Indexing every copy wastes embedding calls and
+lets copies of one clause crowd out the other top-k results.
+
+- Exact duplicates are found by hashing normalized text.
+- Near duplicates are found with 64-bit SimHash fingerprints over word
+  shingles: chunks whose fingerprints differ in at most
+  ``dedup_simhash_distance`` bits are treated as copies. Fingerprints are
+  split into ``distance + 1`` blocks and bucketed by block, so only chunks
+  sharing a whole block are compared (two fingerprints within the distance
+  always share at least one).
+- Near duplicates must also state the same figures. Clauses that differ only
+  in a fee, date, deadline or percentage fingerprint as near duplicates but
+  say different things, so they are kept apart; each near-duplicate merge is
+  logged so merges can be audited.
+
+The first chunk of each group is kept, and its metadata records the sources
+of the chunks merged into it. Chunks are only merged within a category so
+category-filtered retrieval still finds them.
+"""
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from langchain_core.documents import Document
+
+
+SHINGLE_SIZE = 3
+FINGERPRINT_BITS = 64
+
+_WORD_PATTERN = re.compile(r"\w+")
+# Amounts, dates and percentages such as 1,200.50, 14, 01.04.2024 or 2.5%
+_FIGURE_PATTERN = re.compile(r"\d+(?:[.,/]\d+)*%?")
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase words of a chunk, ignoring punctuation, whitespace and list markers."""
+    return _WORD_PATTERN.findall(text.lower())
+
+
+def figures(text: str) -> Tuple[str, ...]:
+    """Numeric tokens of a chunk in order; near duplicates must state the same figures."""
+    return tuple(_FIGURE_PATTERN.findall(text))
+
+
+def _source(chunk: Document) -> str:
+    return chunk.metadata.get("source_name") or chunk.metadata.get("source", "unknown")
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(words: List[str]) -> int:
+    """
+    Compute the SimHash fingerprint of a chunk.
+
+    Args:
+        words: Normalized words of the chunk.
+
+    Returns:
+        A 64-bit fingerprint; similar texts get fingerprints differing in few bits.
+    """
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle in shingles:
+        value = _hash64(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _blocks(fingerprint: int, count: int) -> List[Tuple[int, int]]:
+    """Split a fingerprint into ``count`` blocks, tagged with their position."""
+    bits = FINGERPRINT_BITS // count
+    mask = (1 << bits) - 1
+    return [(index, fingerprint >> (index * bits) & mask) for index in range(count)]
+
+
+def _merge(survivor: Document, duplicate: Document) -> None:
+    sources = [s for s in survivor.metadata.get("merged_sources", "").split(",") if s]
+    source = _source(duplicate)
+    if source not in sources and source != survivor.metadata.get("source_name"):
+        sources.append(source)
+    # Vector store metadata must be scalar, so the sources are stored as one string
+    if sources:
+        survivor.metadata["merged_sources"] = ",".join(sources)
+    survivor.metadata["duplicate_count"] = survivor.metadata.get("duplicate_count", 0) + 1
+
+
+def deduplicate_chunks(chunks: List[Document], max_distance: int = 3) -> List[Document]:
+    """
+    Drop exact and near-duplicate chunks.
+
+    Args:
+        chunks: Chunks with ``category`` metadata.
+        max_distance: Maximum number of differing SimHash bits for two chunks
+            to count as near duplicates (0-15); 0 only removes exact duplicates.
+            Chunks whose figures differ are never near duplicates.
+
+    Returns:
+        The surviving chunks in their original order.
+    """
+    if not 0 <= max_distance < 16:
+        raise ValueError("max_distance must be between 0 and 15")
+
+    exact: Dict[Tuple, Document] = {}
+    buckets: Dict[Tuple, List[Tuple[int, Tuple[str, ...], Document]]] = defaultdict(list)
+    survivors = []
+    exact_count = near_count = figures_kept = 0
+
+    for chunk in chunks:
+        category = chunk.metadata.get("category")
+        words = normalize(chunk.page_content)
+        key = (category, hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest())
+
+        if key in exact:
+            _merge(exact[key], chunk)
+            exact_count += 1
+            continue
+
+        if max_distance:
+            fingerprint = simhash(words)
+            chunk_figures = figures(chunk.page_content)
+            blocks = _blocks(fingerprint, max_distance + 1)
+            similar = [
+                (candidate_figures, candidate)
+                for block in blocks
+                for candidate_fingerprint, candidate_figures, candidate in buckets[(category, block)]
+                if bin(fingerprint ^ candidate_fingerprint).count("1") <= max_distance
+            ]
+            match = next(
+                (candidate for candidate_figures, candidate in similar if candidate_figures == chunk_figures),
+                None
+            )
+            if match is not None:
+                print(
+                    f"Merged near duplicate from {_source(chunk)} into chunk from {_source(match)}: "
+                    f"{chunk.page_content[:80]!r}"
+                )
+                _merge(match, chunk)
+                near_count += 1
+                continue
+            if similar:
+                figures_kept += 1
+            for block in blocks:
+                buckets[(category, block)].append((fingerprint, chunk_figures, chunk))
+
+        exact[key] = chunk
+        survivors.append(chunk)
+
+    print(
+        f"Deduplicated {len(chunks)} chunks to {len(survivors)} "
+        f"({exact_count} exact, {near_count} near duplicates; "
+        f"{figures_kept} near duplicates kept for differing figures)"
+    )
+    return survivors
@@ -0,0 +1,39 @@
+"""
+Query embedding cache.
+
+Repeated questions (guided-flow buttons, common follow-ups) are embedded once
+and the vector is served from the shared cache backend, so every worker
+benefits from a query any worker has already embedded.
+"""
+import hashlib
+from typing import List
+from langchain_core.embeddings import Embeddings
+from backend.core.cache import CacheBackend
+from backend.core.metrics import record_cache
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper serving ``embed_query`` results from a cache backend."""
+
+    def __init__(self, embeddings: Embeddings, cache: CacheBackend, model_id: str, ttl: float | None = None):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_id = model_id
+        self.ttl = ttl
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"embedding:{self.model_id}:{digest}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Documents are embedded once at ingestion, so they are not cached."""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self.cache.get(key)
+        record_cache("embeddings", vector is not None)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.set(key, vector, ttl=self.ttl)
+        return vector
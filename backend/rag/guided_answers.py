@@ -0,0 +1,210 @@
+"""
+Precomputed answers for the guided-flow question catalog.
+
+The guided flow offers a fixed set of buttons, so the questions users ask
+after clicking them are predictable: every flow option carrying a question
+is part of the catalog. After each index run the answers are computed once,
+stored on disk versioned by index generation and served from memory.
+
+The file on disk is the source of truth shared by all workers: each worker
+reloads it whenever its modification time changes, so answers computed by
+another worker (or for a generation that was activated before its answers
+were ready) are picked up on the next request.
+"""
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, List
+from backend.core.config import settings
+from backend.core.metrics import record_cache
+from backend.core.prompts import NO_INFORMATION_ANSWER
+from backend.rag.chain import get_conversational_chain
+from backend.rag.guided_flow import get_flow_questions
+from backend.rag.retriever import similarity_search, get_index_generation
+
+
+# Answers loaded from disk: {"generation": int, "mtime": int, "answers": {key: answer}}
+_store: Dict = {"generation": None, "mtime": None, "answers": {}}
+_lock = threading.Lock()
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+@lru_cache(maxsize=1)
+def get_guided_questions() -> Dict[str, Dict]:
+    """
+    Get the question catalog: key -> question and the category it searches,
+    taken from the options of the declarative guided flow (loaded on first use).
+    """
+    return get_flow_questions()
+
+
+@lru_cache(maxsize=1)
+def _keys_by_question() -> Dict[str, str]:
+    return {
+        normalize_question(entry["question"]): key
+        for key, entry in get_guided_questions().items()
+    }
+
+
+def get_answers_directory() -> str:
+    return os.path.join(settings.chroma_db_path, "guided_answers")
+
+
+def _answers_file(generation: int) -> str:
+    return os.path.join(get_answers_directory(), f"generation_{generation}.json")
+
+
+def precompute_guided_answers(generation: int | None = None) -> int:
+    """
+    Compute and store answers for every catalog question.
+
+    Args:
+        generation: Index generation the answers belong to; defaults to the current one.
+
+    Returns:
+        Number of answers stored.
+    """
+    generation = generation if generation is not None else get_index_generation()
+    chain = get_conversational_chain()
+    answers = {}
+
+    for key, entry in get_guided_questions().items():
+        filters = {"category": [entry["category"], "general"]}
+        docs = similarity_search(entry["question"], k=5, filters=filters)
+
+        if docs:
+            answer = chain.invoke({
+                "question": entry["question"],
+                "context": "\n\n".join(d.page_content for d in docs),
+                "chat_history": ""
+            })
+        else:
+            answer = NO_INFORMATION_ANSWER
+
+        answers[key] = {
+            "key": key,
+            "question": entry["question"],
+            "answer": answer,
+            "sources": [
+                {"source": d.metadata.get("source_name", "unknown"), "page": d.metadata.get("page")}
+                for d in docs
+            ],
+            "generation": generation,
+        }
+
+    directory = get_answers_directory()
+    os.makedirs(directory, exist_ok=True)
+    path = _answers_file(generation)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(answers, f)
+    os.replace(f"{path}.tmp", path)
+
+    # Older generations are no longer served
+    for filename in os.listdir(directory):
+        stem, extension = os.path.splitext(filename)
+        if extension == ".json" and int(stem.rsplit("_", 1)[-1]) < generation:
+            os.remove(os.path.join(directory, filename))
+
+    with _lock:
+        _store.update(generation=generation, mtime=os.stat(path).st_mtime_ns, answers=answers)
+
+    print(f"Precomputed {len(answers)} guided answers for generation {generation}")
+    return len(answers)
+
+
+def _current_answers() -> Dict:
+    """
+    Answers for the current index generation, reloaded from disk whenever the
+    generation or the file changes.
+
+    A missing file is not remembered: answers may still be computing, so the
+    next call looks again.
+    """
+    generation = get_index_generation()
+    path = _answers_file(generation)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    if _store["generation"] == generation and _store["mtime"] == mtime:
+        return _store["answers"]
+
+    with _lock:
+        if _store["generation"] != generation or _store["mtime"] != mtime:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    answers = json.load(f)
+            except FileNotFoundError:
+                return {}
+            _store.update(generation=generation, mtime=mtime, answers=answers)
+        return _store["answers"]
+
+
+def get_guided_answer(key: str) -> Dict | None:
+    """
+    Get the precomputed answer for a catalog entry.
+
+    Args:
+        key: Catalog key.
+
+    Returns:
+        The stored answer, or None if it has not been computed for the current index.
+    """
+    return _current_answers().get(key)
+
+
+def filters_allow(filters: Dict | None, category: str) -> bool:
+    """
+    Whether retrieval filters admit a precomputed answer of the given category.
+
+    Answers were computed from a category's chunks, so any filter on sources
+    rules them out.
+    """
+    if not filters:
+        return True
+    if any(value for field, value in filters.items() if field != "category"):
+        return False
+    allowed = filters.get("category")
+    if not allowed:
+        return True
+    return category in ([allowed] if isinstance(allowed, str) else allowed)
+
+
+def find_guided_answer(question: str, filters: Dict | None = None) -> Dict | None:
+    """
+    Get the precomputed answer for a question matching a catalog entry.
+
+    Args:
+        question: The user's question.
+        filters: Retrieval filters of the request; answers outside them are not used.
+
+    Returns:
+        The stored answer, or None if the question is not in the catalog.
+    """
+    key = _keys_by_question().get(normalize_question(question))
+    if key and not filters_allow(filters, get_guided_questions()[key]["category"]):
+        key = None
+    answer = get_guided_answer(key) if key else None
+    record_cache("guided_answers", answer is not None)
+    return answer
+
+
+def list_guided_questions() -> List[Dict]:
+    """
+    List the catalog with the availability of each precomputed answer.
+    """
+    answers = _current_answers()
+    return [
+        {
+            "key": key,
+            "question": entry["question"],
+            "category": entry["category"],
+            "available": key in answers,
+        }
+        for key, entry in get_guided_questions().items()
+    ]
@@ -0,0 +1,150 @@
+"""
+Declarative guided-flow graph.
+
+The guided flow is defined in a JSON file (``GUIDED_FLOW_PATH``): named steps,
+each with a grid of options. An option either moves to another step
+(``next``) or ends the flow with a reply (``reply``), and may carry the
+``question`` a user clicking it is asking, which is answered ahead of time.
+The file is validated and compiled once per process and served to clients
+as-is, so no client rebuilds the flow itself.
+"""
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+from backend.core.config import settings
+
+
+# Relative GUIDED_FLOW_PATH values are resolved against the project root, not the working directory
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+ALLOWED_GAPS = ("small", "medium", "large")
+
+
+def validate_flow(flow: Dict) -> None:
+    """
+    Check the structure of a guided-flow definition.
+
+    Args:
+        flow: Parsed guided-flow definition.
+
+    Raises:
+        ValueError: Describing the first problem found.
+    """
+    steps = flow.get("steps")
+    if not isinstance(steps, dict) or not steps:
+        raise ValueError("Guided flow must define at least one step")
+    if flow.get("start") not in steps:
+        raise ValueError(f"Guided flow start step {flow.get('start')!r} is not defined")
+
+    seen_ids = set()
+    for name, step in steps.items():
+        options = step.get("options")
+        if not options:
+            raise ValueError(f"Step {name!r} has no options")
+        if step.get("gap", "small") not in ALLOWED_GAPS:
+            raise ValueError(f"Step {name!r} has an invalid gap {step['gap']!r}")
+
+        for option in options:
+            option_id = option.get("id")
+            if not option_id or not option.get("label"):
+                raise ValueError(f"Every option of step {name!r} needs an id and a label")
+            if option_id in seen_ids:
+                raise ValueError(f"Option id {option_id!r} is used more than once")
+            seen_ids.add(option_id)
+            if ("next" in option) == ("reply" in option):
+                raise ValueError(f"Option {option_id!r} must have exactly one of 'next' or 'reply'")
+            if "next" in option and option["next"] not in steps:
+                raise ValueError(f"Option {option_id!r} points to unknown step {option['next']!r}")
+
+    # Every step must be reachable from the start
+    reachable = set()
+    pending = [flow["start"]]
+    while pending:
+        name = pending.pop()
+        if name in reachable:
+            continue
+        reachable.add(name)
+        pending.extend(option["next"] for option in steps[name]["options"] if "next" in option)
+    unreachable = set(steps) - reachable
+    if unreachable:
+        raise ValueError(f"Steps not reachable from the start: {', '.join(sorted(unreachable))}")
+
+
+def compile_flow(flow: Dict) -> Dict:
+    """
+    Resolve defaults and option categories into the structure served to clients.
+
+    Args:
+        flow: Validated guided-flow definition.
+
+    Returns:
+        The compiled flow.
+    """
+    steps = flow["steps"]
+    compiled_steps = {}
+    for name, step in steps.items():
+        options = []
+        for option in step["options"]:
+            # Navigation options search the category of the step they open
+            target = steps[option["next"]] if "next" in option else step
+            options.append({
+                "id": option["id"],
+                "label": option["label"],
+                "next": option.get("next"),
+                "reply": option.get("reply"),
+                "question": option.get("question"),
+                "category": option.get("category") or target.get("category"),
+            })
+        compiled_steps[name] = {
+            "title": step.get("title"),
+            "category": step.get("category"),
+            "columns": step.get("columns", len(options)),
+            "gap": step.get("gap", "small"),
+            "options": options,
+        }
+    return {"start": flow["start"], "steps": compiled_steps}
+
+
+def get_flow_path() -> str:
+    """
+    Path of the flow definition; relative paths are resolved against the project root.
+    """
+    path = Path(settings.guided_flow_path)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    return str(path)
+
+
+@lru_cache(maxsize=1)
+def get_guided_flow() -> Dict:
+    """
+    Load, validate and compile the guided flow (once per process).
+
+    Returns:
+        The compiled flow, with a ``version`` hash of its definition.
+    """
+    with open(get_flow_path(), encoding="utf-8") as f:
+        raw = f.read()
+    flow = json.loads(raw)
+    validate_flow(flow)
+
+    compiled = compile_flow(flow)
+    compiled["version"] = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+    return compiled
+
+
+def get_flow_questions() -> Dict[str, Dict]:
+    """
+    Get the questions attached to flow options, keyed by option id.
+
+    Returns:
+        Mapping of option id to its question and category.
+    """
+    return {
+        option["id"]: {"question": option["question"], "category": option["category"] or "general"}
+        for step in get_guided_flow()["steps"].values()
+        for option in step["options"]
+        if option["question"]
+    }
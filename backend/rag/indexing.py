@@ -0,0 +1,157 @@
+"""
+Zero-downtime index rebuilds.
+
+A rebuild writes the next generation into a fresh collection while searches
+keep using the active one. The new collection is validated and then
+activated with an atomic alias flip. The previous generation is kept, so
+searches that started just before the flip can finish, and older
+generations are deleted.
+"""
+import threading
+import time
+from typing import Dict, List
+from langchain_core.documents import Document
+from backend.core.config import settings
+from backend.rag.ingestion import load_documents, split_documents
+from backend.rag.retriever import (
+    activate_collection,
+    drop_collection,
+    generation_collection_name,
+    get_index_generation,
+    get_vectorstore,
+    list_generations,
+)
+
+
+# Number of probe chunks that must be found again before a generation is activated
+VALIDATION_PROBES = 3
+
+_build_lock = threading.Lock()
+
+# Progress of the most recent build, reported by the API
+BUILD_STATUS: Dict = {
+    "state": "idle",
+    "generation": None,
+    "documents_loaded": 0,
+    "chunks_created": 0,
+    "error": None,
+    "started_at": None,
+    "finished_at": None,
+}
+
+
+def validate_generation(collection_name: str, chunks: List[Document]) -> None:
+    """
+    Check a newly built collection before it is activated.
+
+    Args:
+        collection_name: Collection that was built.
+        chunks: Chunks that were added to it.
+
+    Raises:
+        ValueError: If chunks are missing or probe chunks cannot be found.
+    """
+    vectorstore = get_vectorstore(collection_name=collection_name)
+    count = vectorstore._collection.count()
+    if count != len(chunks):
+        raise ValueError(f"Collection {collection_name} has {count} chunks, expected {len(chunks)}")
+
+    step = max(1, len(chunks) // VALIDATION_PROBES)
+    for chunk in chunks[::step][:VALIDATION_PROBES]:
+        results = vectorstore.similarity_search(chunk.page_content, k=1)
+        if not results or results[0].page_content != chunk.page_content:
+            raise ValueError(f"Collection {collection_name} did not return a probe chunk")
+
+
+def collect_old_generations(keep: int) -> List[str]:
+    """
+    Delete all but the newest ``keep`` generations, never the active one.
+
+    Returns:
+        Names of the deleted collections.
+    """
+    active = get_index_generation()
+    generations = sorted(list_generations().items(), key=lambda item: item[1], reverse=True)
+    deleted = []
+    for name, generation in generations[keep:]:
+        if generation != active:
+            drop_collection(name)
+            deleted.append(name)
+    return deleted
+
+
+def build_index() -> int:
+    """
+    Build the next index generation from the document directory and activate it.
+
+    The active collection keeps serving searches until the new one is
+    validated; on failure the new collection is dropped and nothing changes.
+
+    Returns:
+        The activated generation.
+    """
+    generation = max([get_index_generation(), *list_generations().values()]) + 1
+    collection_name = generation_collection_name(generation)
+    BUILD_STATUS.update(
+        state="building",
+        generation=generation,
+        documents_loaded=0,
+        chunks_created=0,
+        error=None,
+        started_at=time.time(),
+        finished_at=None,
+    )
+
+    try:
+        documents = load_documents()
+        chunks = split_documents(documents)
+        BUILD_STATUS.update(documents_loaded=len(documents), chunks_created=len(chunks))
+
+        if not chunks:
+            raise ValueError("No chunks to index")
+
+        get_vectorstore(collection_name=collection_name).add_documents(chunks)
+        validate_generation(collection_name, chunks)
+
+        activate_collection(collection_name, generation)
+    except Exception as e:
+        drop_collection(collection_name)
+        BUILD_STATUS.update(state="failed", error=str(e), finished_at=time.time())
+        raise
+
+    deleted = collect_old_generations(settings.index_generations_kept)
+    BUILD_STATUS.update(state="completed", finished_at=time.time())
+    print(f"Activated index generation {generation} with {len(chunks)} chunks, deleted {deleted}")
+    return generation
+
+
+def start_build() -> bool:
+    """
+    Reserve the builder; only one build runs at a time.
+
+    Returns:
+        False if a build is already running.
+    """
+    if not _build_lock.acquire(blocking=False):
+        return False
+    BUILD_STATUS.update(state="scheduled", error=None)
+    return True
+
+
+def run_build(on_activated=None) -> None:
+    """
+    Run a build reserved with :func:`start_build` (in a background task).
+
+    Args:
+        on_activated: Called with the new generation after it is activated.
+    """
+    try:
+        generation = build_index()
+    except Exception as e:
+        print(f"Index build failed, keeping the active generation: {e}")
+        return
+    finally:
+        _build_lock.release()
+
+    if on_activated is not None:
+        on_activated(generation)
@@ -2,18 +2,74 @@
 Document ingestion for RAG pipeline.
 """
 import os
+import re
 from typing import List
-from langchain_community.document_loaders import PyPDFLoader, TextLoader, CSVLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 from backend.core.config import settings
 from pathlib import Path
 
+
+# Keywords used to tag chunks with the guided-flow category they belong to
+CATEGORY_KEYWORDS = {
+    "legal": (
+        "will writing", "single will", "mirror will", "living will",
+        "advance directive", "lasting power of attorney", "lpa",
+    ),
+    "bereavement": (
+        "bereavement", "executor", "probate", "estate administration",
+        "grief", "callback", "someone dies",
+    ),
+    "final_wishes": (
+        "final wishes", "funeral", "personal message", "digital legacy",
+        "trusted people", "nags", "my documents", "digital filing",
+    ),
+}
+DEFAULT_CATEGORY = "general"
+
+# Keywords match whole words only, so short ones such as "lpa" or "nags" do
+# not count inside longer words ("flpa", "snags")
+CATEGORY_PATTERNS = {
+    category: re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")\b")
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+
+# Separators tried in order by the character splitter; headings marked during
+# PDF extraction come first so chunks follow section boundaries
+DEFAULT_SEPARATORS = ["\n## ", "\n\n", "\n", ".", "!", "?", ",", " ", ""]
+
+
+def infer_category(text: str) -> str:
+    """
+    Infer the guided-flow category of a chunk from its content.
+    
+    Args:
+        text: Chunk text.
+    
+    Returns:
+        The best matching category, or the default category when no keyword matches.
+    """
+    text = text.lower()
+    scores = {
+        category: len(pattern.findall(text))
+        for category, pattern in CATEGORY_PATTERNS.items()
+    }
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else DEFAULT_CATEGORY
+
+
 def get_loader(file_path: str):
+    # Loaders (and pypdf) are only needed when ingestion actually runs
+    from langchain_community.document_loaders import TextLoader, CSVLoader
+    from backend.rag.docx_extraction import DocxLoader
+    from backend.rag.pdf_extraction import CachedPDFLoader
+
     extension = Path(file_path).suffix.lower()
 
     if extension == ".pdf":
-        return PyPDFLoader(file_path)   # ✅ no encoding
+        return CachedPDFLoader(file_path)
+
+    if extension == ".docx":
+        return DocxLoader(file_path)
 
     if extension == ".txt":
         return TextLoader(file_path, encoding="utf-8")
@@ -57,12 +113,23 @@ def load_documents(documents_path: str | None = None) -> list[Document]:
     return documents
 
 
-def split_documents(documents: List[Document] = None) -> List[Document]:
+def split_documents(
+    documents: List[Document] = None,
+    chunk_size: int | None = None,
+    chunk_overlap: int | None = None,
+    separators: List[str] | None = None,
+    deduplicate: bool | None = None,
+) -> List[Document]:
     """
     Split documents into smaller chunks for better retrieval.
     
     Args:
         documents: List of documents to split.
+        chunk_size: Maximum chunk size; defaults to the configured value.
+        chunk_overlap: Overlap between chunks; defaults to the configured value.
+        separators: Character splitter separators; defaults to DEFAULT_SEPARATORS.
+            Passing separators forces the character splitter.
+        deduplicate: Drop duplicate chunks; defaults to the configured value.
     
     Returns:
         List of document chunks.
@@ -70,18 +137,35 @@ def split_documents(documents: List[Document] = None) -> List[Document]:
     if documents is None:
         documents = load_documents()
     
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=settings.chunk_size,
-        chunk_overlap=settings.chunk_overlap,
-        separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""]
-    )
+    chunk_size = chunk_size or settings.chunk_size
+    chunk_overlap = settings.chunk_overlap if chunk_overlap is None else chunk_overlap
+    
+    if separators is None and settings.text_splitter == "structure":
+        from backend.rag.splitters import StructureAwareSplitter
+        
+        text_splitter = StructureAwareSplitter(chunk_size, chunk_overlap, DEFAULT_SEPARATORS)
+    else:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=separators or DEFAULT_SEPARATORS
+        )
     
     chunks = text_splitter.split_documents(documents)
     
-    # Add metadata about source
+    # Add metadata about source and category, used for filtered retrieval
     for chunk in chunks:
         if "source" not in chunk.metadata:
             chunk.metadata["source"] = chunk.metadata.get("source", "unknown")
+        chunk.metadata["source_name"] = os.path.basename(chunk.metadata["source"])
+        chunk.metadata["category"] = infer_category(chunk.page_content)
+    
+    if settings.dedup_enabled if deduplicate is None else deduplicate:
+        from backend.rag.dedup import deduplicate_chunks
+        
+        chunks = deduplicate_chunks(chunks, max_distance=settings.dedup_simhash_distance)
     
     return chunks
 
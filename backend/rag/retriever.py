@@ -1,48 +1,198 @@
 """
 Retriever component for RAG pipeline using ChromaDB.
+
+Each index build writes a new collection named ``{collection}_g{generation}``.
+An alias file in the ChromaDB directory names the collection searches use;
+it is replaced atomically once a new generation is built and validated, so
+searches never see a partly built index.
 """
+import json
 import os
-from typing import List
-from langchain_chroma import Chroma
+import re
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import DeterministicFakeEmbedding
 from backend.core.config import settings
+from backend.core.llm import get_http_client, get_async_http_client
+from backend.core.metrics import track_stage
+from backend.core.cache import get_cache
+from backend.rag.batching import BatchingEmbeddings
+from backend.rag.embedding_cache import CachedEmbeddings
+
+# The ChromaDB and OpenAI clients are imported when first used so that
+# importing the API does not pay for them; the readiness warm-up loads them.
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+
+
+# Serializes opening stores: concurrent first opens of a ChromaDB client race
+_open_lock = threading.Lock()
+
+# Chunk metadata fields that callers are allowed to filter on
+FILTERABLE_FIELDS = ("category", "source", "source_name")
+
+# File inside the ChromaDB directory naming the active collection and its generation
+ALIAS_FILE = "active_collection.json"
 
+# Generation counter written before versioned collections existed
+LEGACY_GENERATION_FILE = "index_generation"
 
+
+def build_filter(filters: Dict | None) -> Dict | None:
+    """
+    Translate API metadata filters into a ChromaDB ``where`` clause.
+    
+    Args:
+        filters: Mapping of metadata field to a value or a list of accepted values.
+    
+    Returns:
+        A ChromaDB where clause, or None when there is nothing to filter on.
+    
+    Raises:
+        ValueError: If a filter field is not filterable.
+    """
+    if not filters:
+        return None
+    
+    clauses = []
+    for field, value in filters.items():
+        if field not in FILTERABLE_FIELDS:
+            raise ValueError(f"Unsupported filter field: {field}")
+        if value is None or value == []:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            clauses.append({field: {"$in": list(value)}})
+        else:
+            clauses.append({field: value})
+    
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+@lru_cache(maxsize=1)
 def get_embeddings():
     """
-    Get the embeddings model based on configuration.
+    Get the shared embeddings model based on configuration.
+    
+    Query embeddings are served from the shared cache when possible, and
+    concurrent misses are coalesced into batch calls unless batching is
+    disabled.
     
     Returns:
         An embeddings model instance.
     """
-    return OpenAIEmbeddings(api_key=settings.openai_api_key)
+    if settings.embedding_provider == "local":
+        embeddings = DeterministicFakeEmbedding(size=settings.local_embedding_size)
+        model_id = f"local-{settings.local_embedding_size}"
+    else:
+        from langchain_openai import OpenAIEmbeddings
+
+        embeddings = OpenAIEmbeddings(
+            api_key=settings.openai_api_key,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
+        )
+        model_id = f"openai-{embeddings.model}"
+    
+    if settings.embedding_batch_enabled:
+        embeddings = BatchingEmbeddings(
+            embeddings,
+            window_ms=settings.embedding_batch_window_ms,
+            max_batch_size=settings.embedding_batch_max_size
+        )
+    
+    if settings.embedding_cache_enabled:
+        embeddings = CachedEmbeddings(
+            embeddings,
+            get_cache(),
+            model_id=model_id,
+            ttl=settings.embedding_cache_ttl
+        )
+    
+    return embeddings
+
+
+@lru_cache(maxsize=None)
+def _open_vectorstore(persist_directory: str, collection_name: str) -> "Chroma":
+    from langchain_chroma import Chroma
+
+    # Ensure directory exists
+    os.makedirs(persist_directory, exist_ok=True)
+    
+    with track_stage("vectorstore_init"):
+        return Chroma(
+            persist_directory=persist_directory,
+            embedding_function=get_embeddings(),
+            collection_name=collection_name
+        )
+
+
+def _legacy_generation(persist_directory: str) -> int:
+    try:
+        with open(os.path.join(persist_directory, LEGACY_GENERATION_FILE)) as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
 
 
-def get_vectorstore(persist_directory: str = None) -> Chroma:
+@lru_cache(maxsize=8)
+def _load_alias(path: str, mtime_ns: int) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def get_active_alias(persist_directory: str = None) -> Dict:
     """
-    Get or create the ChromaDB vector store.
+    Get the active collection and its generation.
+    
+    The alias file is only re-read when it changes, so every worker process
+    picks up a flip with a single ``stat`` per lookup.
     
     Args:
-        persist_directory: Directory to persist the vector store.
+        persist_directory: Directory of the vector store.
     
     Returns:
-        A ChromaDB vector store instance.
+        Dictionary with the active ``collection`` name and ``generation``.
     """
     persist_directory = persist_directory or settings.chroma_db_path
+    path = os.path.join(persist_directory, ALIAS_FILE)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        # Indexes built before versioned collections use the unversioned name
+        return {
+            "collection": settings.chroma_collection_name,
+            "generation": _legacy_generation(persist_directory)
+        }
+    return _load_alias(path, mtime_ns)
+
+
+def generation_collection_name(generation: int) -> str:
+    return f"{settings.chroma_collection_name}_g{generation}"
+
+
+def get_vectorstore(persist_directory: str = None, collection_name: str = None) -> "Chroma":
+    """
+    Get the shared ChromaDB vector store.
     
-    # Ensure directory exists
-    os.makedirs(persist_directory, exist_ok=True)
-    
-    embeddings = get_embeddings()
+    The store is opened once per collection and reused by every request.
     
-    vectorstore = Chroma(
-        persist_directory=persist_directory,
-        embedding_function=embeddings,
-        collection_name=settings.chroma_collection_name
-    )
+    Args:
+        persist_directory: Directory to persist the vector store.
+        collection_name: Collection to open; defaults to the active one.
     
-    return vectorstore
+    Returns:
+        A ChromaDB vector store instance.
+    """
+    persist_directory = persist_directory or settings.chroma_db_path
+    collection_name = collection_name or get_active_alias(persist_directory)["collection"]
+    with _open_lock:
+        return _open_vectorstore(persist_directory, collection_name)
 
 
 def add_documents_to_vectorstore(documents: List[Document]) -> None:
@@ -57,44 +207,122 @@ def add_documents_to_vectorstore(documents: List[Document]) -> None:
     print(f"Added {len(documents)} documents to vector store")
 
 
-def similarity_search(query: str, k: int = 5) -> List[Document]:
+def similarity_search(query: str, k: int = 5, filters: Dict | None = None) -> List[Document]:
     """
     Search for similar documents.
     
     Args:
         query: The search query.
         k: Number of results to return.
+        filters: Optional metadata filters pushed down into the vector store.
     
     Returns:
         List of similar documents.
     """
     vectorstore = get_vectorstore()
-    results = vectorstore.similarity_search(query, k=k)
+    where = build_filter(filters)
+    
+    # Embed and search separately so each shows up as its own stage
+    with track_stage("embedding"):
+        embedding = vectorstore.embeddings.embed_query(query)
+    with track_stage("vector_search"):
+        results = vectorstore.similarity_search_by_vector(embedding, k=k, filter=where)
     return results
 
 
-def similarity_search_with_score(query: str, k: int = 5) -> List[tuple]:
+def similarity_search_with_score(query: str, k: int = 5, filters: Dict | None = None) -> List[tuple]:
     """
     Search for similar documents with scores.
     
     Args:
         query: The search query.
         k: Number of results to return.
+        filters: Optional metadata filters pushed down into the vector store.
     
     Returns:
         List of tuples containing (document, score).
     """
     vectorstore = get_vectorstore()
-    results = vectorstore.similarity_search_with_score(query, k=k)
+    results = vectorstore.similarity_search_with_score(query, k=k, filter=build_filter(filters))
     return results
 
 
+def get_index_generation(persist_directory: str = None) -> int:
+    """
+    Get the generation number of the current index.
+    
+    Args:
+        persist_directory: Directory of the vector store.
+    
+    Returns:
+        The generation of the active collection, 0 if the index was never built.
+    """
+    return get_active_alias(persist_directory)["generation"]
+
+
+def activate_collection(collection_name: str, generation: int, persist_directory: str = None) -> None:
+    """
+    Atomically point searches at another collection.
+    
+    Args:
+        collection_name: Collection to activate.
+        generation: Index generation of the collection.
+        persist_directory: Directory of the vector store.
+    """
+    persist_directory = persist_directory or settings.chroma_db_path
+    os.makedirs(persist_directory, exist_ok=True)
+    
+    path = os.path.join(persist_directory, ALIAS_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({"collection": collection_name, "generation": generation}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def list_generations(persist_directory: str = None) -> Dict[str, int]:
+    """
+    List the index collections in the vector store.
+    
+    Args:
+        persist_directory: Directory of the vector store.
+    
+    Returns:
+        Mapping of collection name to generation; an unversioned collection
+        from before versioning counts as generation -1.
+    """
+    client = get_vectorstore(persist_directory)._client
+    pattern = re.compile(rf"^{re.escape(settings.chroma_collection_name)}_g(\d+)$")
+    
+    generations = {}
+    for collection in client.list_collections():
+        # Older chromadb versions return Collection objects instead of names
+        name = getattr(collection, "name", collection)
+        match = pattern.match(name)
+        if match:
+            generations[name] = int(match.group(1))
+        elif name == settings.chroma_collection_name:
+            generations[name] = -1
+    return generations
+
+
+def drop_collection(collection_name: str, persist_directory: str = None) -> None:
+    """
+    Delete a collection if it exists, closing any store opened on it.
+    """
+    persist_directory = persist_directory or settings.chroma_db_path
+    client = get_vectorstore(persist_directory)._client
+    if collection_name in list_generations(persist_directory):
+        client.delete_collection(collection_name)
+    _open_vectorstore.cache_clear()
+
+
 def delete_collection() -> None:
     """
     Delete the current collection.
     """
     vectorstore = get_vectorstore()
     vectorstore.delete_collection()
+    # The next access reopens (and recreates) the collection
+    _open_vectorstore.cache_clear()
     print("Collection deleted")
 
 
@@ -0,0 +1,121 @@
+"""
+Single-flight deduplication of identical in-flight requests.
+
+When many users ask the same question at the same moment, only the first
+request runs retrieval and the LLM completion; the others await the same
+result (or replay the same token stream) instead of repeating the work.
+This is not a cache: entries only live while the work is in flight.
+"""
+import asyncio
+import hashlib
+import json
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+from backend.core.metrics import record_cache
+
+
+def request_key(question: str, filters: Dict | None = None, context: str = "") -> str:
+    """
+    Build the deduplication key for a chat request.
+
+    Args:
+        question: The user's question (normalized for case and whitespace).
+        filters: Metadata filters applied to retrieval.
+        context: Any other input the answer depends on, such as chat history.
+
+    Returns:
+        A stable hex digest identifying equivalent requests.
+    """
+    normalized = " ".join(question.lower().split())
+    payload = json.dumps([normalized, filters or {}, context], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SharedStream:
+    """A token stream produced once and replayed to every subscriber."""
+
+    def __init__(self, source: AsyncIterator[str]):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self._condition = asyncio.Condition()
+        self.task = asyncio.ensure_future(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in source:
+                async with self._condition:
+                    self.chunks.append(chunk)
+                    self._condition.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            async with self._condition:
+                self.done = True
+                self._condition.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """Yield every chunk from the start, including ones produced before subscribing."""
+        position = 0
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: position < len(self.chunks) or self.done)
+                pending = self.chunks[position:]
+                finished = self.done
+
+            for chunk in pending:
+                yield chunk
+            position += len(pending)
+
+            if finished and position >= len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class SingleFlight:
+    """Registry of in-flight work keyed by request identity."""
+
+    def __init__(self):
+        self.shared_count = 0
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, SharedStream] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        """
+        Run ``fn`` once for all concurrent callers with the same key.
+
+        The work runs as its own task, so a caller disconnecting does not
+        cancel it for the others.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._release(self._calls, key, task))
+            record_cache("singleflight", False)
+        else:
+            self.shared_count += 1
+            record_cache("singleflight", True)
+
+        return await asyncio.shield(task)
+
+    def stream(self, key: str, fn: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """
+        Subscribe to the token stream for ``key``, starting it if none is in flight.
+        """
+        shared = self._streams.get(key)
+        if shared is None:
+            shared = SharedStream(fn())
+            self._streams[key] = shared
+            shared.task.add_done_callback(lambda _: self._release(self._streams, key, shared))
+            record_cache("singleflight", False)
+        else:
+            self.shared_count += 1
+            record_cache("singleflight", True)
+
+        return shared.subscribe()
+
+    @staticmethod
+    def _release(registry: Dict, key: str, entry) -> None:
+        if registry.get(key) is entry:
+            del registry[key]
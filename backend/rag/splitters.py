@@ -0,0 +1,138 @@
+"""
+Structure-aware document splitting.
+
+Instead of cutting text every ``chunk_size`` characters, documents are split
+at their own boundaries:
+
+- CSV documents (one per row) are kept whole, so a row is never cut in half.
+- Text is split into sections at markdown headings (marked during PDF and
+  DOCX extraction). Consecutive small sections are packed together up to
+  ``chunk_size``; larger sections are split between paragraphs, and each
+  continuation chunk repeats the section heading.
+- Only a single paragraph larger than ``chunk_size`` falls back to the
+  character splitter.
+
+Chunks are semantically whole, so they need no overlap and there are fewer
+of them than with character splitting.
+"""
+import re
+from typing import List, Optional, Tuple
+from langchain_core.documents import Document
+
+
+HEADING_PATTERN = re.compile(r"^#{1,6} ", re.MULTILINE)
+
+
+def split_sections(text: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Split text at markdown headings.
+
+    Args:
+        text: Document text.
+
+    Returns:
+        ``(heading, text)`` pairs; the heading is None for text before the first heading.
+    """
+    starts = [match.start() for match in HEADING_PATTERN.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+
+    sections = []
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        section = text[start:end].strip()
+        if not section:
+            continue
+        heading = section.split("\n", 1)[0] if HEADING_PATTERN.match(section) else None
+        sections.append((heading, section))
+    return sections
+
+
+class StructureAwareSplitter:
+    """Splits documents at headings, paragraphs and CSV rows instead of character counts."""
+
+    def __init__(self, chunk_size: int, chunk_overlap: int, separators: List[str]):
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+        self.chunk_size = chunk_size
+        # Used only for paragraphs that do not fit in a single chunk
+        self._fallback = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=separators
+        )
+
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        chunks = []
+        for document in documents:
+            if "row" in document.metadata:
+                texts = [(None, text) for text in self._split_oversized(document.page_content)]
+            else:
+                texts = self.split_text(document.page_content)
+            for heading, text in texts:
+                metadata = dict(document.metadata)
+                if heading:
+                    metadata["section"] = heading.lstrip("# ")
+                chunks.append(Document(page_content=text, metadata=metadata))
+        return chunks
+
+    def split_text(self, text: str) -> List[Tuple[Optional[str], str]]:
+        """
+        Split text into chunks of whole sections or paragraphs.
+
+        Args:
+            text: Document text.
+
+        Returns:
+            ``(heading, chunk)`` pairs, where heading is the section the chunk starts in.
+        """
+        chunks: List[Tuple[Optional[str], str]] = []
+        current: List[str] = []
+        current_heading: Optional[str] = None
+
+        def flush():
+            if current:
+                chunks.append((current_heading, "\n\n".join(current)))
+                current.clear()
+
+        for heading, section in split_sections(text):
+            if len(section) > self.chunk_size:
+                flush()
+                chunks.extend((heading, chunk) for chunk in self._split_section(heading, section))
+                continue
+
+            if current and len("\n\n".join(current)) + 2 + len(section) > self.chunk_size:
+                flush()
+            if not current:
+                current_heading = heading
+            current.append(section)
+
+        flush()
+        return chunks
+
+    def _split_section(self, heading: Optional[str], section: str) -> List[str]:
+        """Pack the paragraphs of an oversized section, repeating its heading in every chunk."""
+        paragraphs = [p.strip() for p in section.split("\n\n") if p.strip()]
+        if heading and paragraphs and paragraphs[0].startswith(heading):
+            paragraphs[0] = paragraphs[0][len(heading):].strip()
+            paragraphs = [p for p in paragraphs if p]
+        prefix = f"{heading}\n\n" if heading else ""
+        room = max(self.chunk_size - len(prefix), self.chunk_size // 2)
+
+        chunks = []
+        current: List[str] = []
+        for paragraph in paragraphs:
+            if current and len("\n\n".join(current)) + 2 + len(paragraph) > room:
+                chunks.append(prefix + "\n\n".join(current))
+                current = []
+            if len(paragraph) > room:
+                chunks.extend(prefix + part for part in self._split_oversized(paragraph))
+            else:
+                current.append(paragraph)
+        if current:
+            chunks.append(prefix + "\n\n".join(current))
+        return chunks
+
+    def _split_oversized(self, text: str) -> List[str]:
+        if len(text) <= self.chunk_size:
+            return [text]
+        return self._fallback.split_text(text)
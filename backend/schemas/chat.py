@@ -1,7 +1,7 @@
 """
 Pydantic schemas for chat API.
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -9,15 +9,26 @@ from datetime import datetime
 # Chat schemas
 class ChatMessage(BaseModel):
     """Schema for a chat message."""
+    id: Optional[int] = Field(None, description="Message ID, used as the cursor when paging")
     role: str = Field(..., description="Role of the message sender (user/assistant)")
     content: str = Field(..., description="Content of the message")
 
 
+class MessagePage(BaseModel):
+    """Schema for one page of a conversation's messages, oldest first."""
+    messages: List[ChatMessage]
+    has_more: bool = Field(..., description="Whether older messages exist")
+    next_before_id: Optional[int] = Field(None, description="Pass as before_id to load the previous page")
+
+
 class ChatRequest(BaseModel):
     """Schema for chat request."""
     message: str = Field(..., description="User's message")
     conversation_id: Optional[int] = Field(None, description="Conversation ID for continuity")
     use_history: bool = Field(True, description="Whether to use conversation history")
+    filters: Optional[Dict[str, Union[str, List[str]]]] = Field(
+        None, description="Metadata filters (category, source, source_name) applied to retrieval"
+    )
 
 
 class ChatResponse(BaseModel):
@@ -75,3 +86,21 @@ class ConversationListResponse(BaseModel):
     conversations: List[ConversationResponse]
     total: int
 
+
+
+# Guided flow schemas
+class GuidedQuestion(BaseModel):
+    """Schema for a guided-flow catalog question."""
+    key: str
+    question: str
+    category: str
+    available: bool
+
+
+class GuidedAnswerResponse(BaseModel):
+    """Schema for a precomputed guided-flow answer."""
+    key: str
+    question: str
+    answer: str
+    sources: List[dict]
+    generation: int
@@ -0,0 +1,234 @@
+// Minimal chat client served by the API itself: no per-user server session,
+// answers are streamed from /chat/stream as server-sent events.
+const API = "/api/v1";
+const PAGE_SIZE = 30;
+
+const state = {
+  conversationId: null,
+  olderBeforeId: null,
+  filters: null,
+  flow: null,
+  step: null,
+};
+
+const $ = (id) => document.getElementById(id);
+
+async function api(path, options = {}) {
+  const response = await fetch(API + path, {
+    headers: { "Content-Type": "application/json" },
+    ...options,
+  });
+  if (!response.ok) throw new Error(`${response.status} ${response.statusText}`);
+  return response.json();
+}
+
+function escapeHtml(text) {
+  return text.replace(/[&<>"']/g, (c) => ({ "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" })[c]);
+}
+
+// Only links are rendered from markdown; everything else is shown as text
+function renderMarkdown(text) {
+  return escapeHtml(text).replace(
+    /\[([^\]]+)\]\((https?:\/\/[^)\s]+)\)/g,
+    '<a href="$2" target="_blank" rel="noopener">$1</a>'
+  );
+}
+
+function messageElement(role, content) {
+  const element = document.createElement("div");
+  element.className = `message ${role}`;
+  element.innerHTML = renderMarkdown(content);
+  return element;
+}
+
+function appendMessage(role, content) {
+  const element = messageElement(role, content);
+  $("messages").appendChild(element);
+  element.scrollIntoView({ block: "end" });
+  return element;
+}
+
+// ---- conversations ----
+
+async function loadConversations() {
+  const list = $("conversations");
+  try {
+    const data = await api("/conversations?limit=20");
+    list.replaceChildren(...data.conversations.map((conversation) => {
+      const item = document.createElement("li");
+      const open = document.createElement("button");
+      open.textContent = `💬 ${conversation.title}`;
+      open.onclick = () => openConversation(conversation.id);
+      const remove = document.createElement("button");
+      remove.textContent = "🗑";
+      remove.title = "Delete conversation";
+      remove.onclick = () => deleteConversation(conversation.id);
+      item.append(open, remove);
+      return item;
+    }));
+  } catch (error) {
+    list.textContent = "Could not load conversations";
+  }
+}
+
+async function loadPage(beforeId) {
+  const query = `limit=${PAGE_SIZE}` + (beforeId ? `&before_id=${beforeId}` : "");
+  const page = await api(`/chat/${state.conversationId}/messages/page?${query}`);
+  state.olderBeforeId = page.has_more ? page.next_before_id : null;
+  $("load-older").hidden = state.olderBeforeId === null;
+  return page.messages.map((message) => messageElement(message.role, message.content));
+}
+
+async function openConversation(id) {
+  state.conversationId = id;
+  state.filters = null;
+  setGuidedStep(null);
+  $("messages").replaceChildren(...await loadPage(null));
+  $("messages").lastElementChild?.scrollIntoView({ block: "end" });
+}
+
+async function loadOlder() {
+  const elements = await loadPage(state.olderBeforeId);
+  $("messages").prepend(...elements);
+}
+
+async function deleteConversation(id) {
+  await api(`/conversations/${id}`, { method: "DELETE" });
+  if (id === state.conversationId) newChat();
+  loadConversations();
+}
+
+function newChat() {
+  state.conversationId = null;
+  state.olderBeforeId = null;
+  state.filters = null;
+  $("load-older").hidden = true;
+  $("messages").replaceChildren();
+  appendMessage("assistant", "Hello! I am your Trust Inheritance Legal AI Assistant, How can I help you today!");
+  setGuidedStep(state.flow ? state.flow.start : null);
+}
+
+// ---- guided flow ----
+
+function setGuidedStep(name) {
+  state.step = name;
+  const container = $("guided");
+  container.replaceChildren();
+  if (!name || !state.flow) return;
+
+  const step = state.flow.steps[name];
+  container.style.gridTemplateColumns = `repeat(${step.columns}, 1fr)`;
+  if (step.title) {
+    const title = document.createElement("h3");
+    title.textContent = step.title;
+    container.appendChild(title);
+  }
+  for (const option of step.options) {
+    const button = document.createElement("button");
+    button.textContent = option.label;
+    button.onclick = () => selectOption(option);
+    container.appendChild(button);
+  }
+}
+
+// Answers to the questions behind options are computed ahead of time by the API
+async function showGuidedAnswer(option) {
+  if (!option.question) return;
+  try {
+    const response = await fetch(`${API}/guided/answers/${encodeURIComponent(option.id)}`);
+    if (response.ok) appendMessage("assistant", (await response.json()).answer);
+  } catch (error) {
+    // Unavailable answers are simply not shown
+  }
+}
+
+async function selectOption(option) {
+  if (option.next) {
+    appendMessage("user", option.label);
+    if (option.category) state.filters = { category: [option.category, "general"] };
+    setGuidedStep(option.next);
+    await showGuidedAnswer(option);
+  } else {
+    setGuidedStep(null);
+    await showGuidedAnswer(option);
+    appendMessage("assistant", option.reply);
+  }
+}
+
+// ---- streaming chat ----
+
+async function sendMessage(text) {
+  setGuidedStep(null);
+  appendMessage("user", text);
+  const answer = appendMessage("assistant", "…");
+  const showError = (message) => {
+    answer.className = "message error";
+    answer.textContent = `Error: ${message}`;
+  };
+  let content = "";
+
+  try {
+    const response = await fetch(`${API}/chat/stream`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ message: text, conversation_id: state.conversationId, filters: state.filters }),
+    });
+    if (!response.ok) {
+      showError(`${response.status} ${response.statusText}`);
+      return;
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      const events = buffer.split("\n\n");
+      buffer = events.pop();
+      for (const raw of events) {
+        if (!raw.startsWith("data: ")) continue;
+        const event = JSON.parse(raw.slice(6));
+        if (event.type === "conversation") {
+          state.conversationId = event.conversation_id;
+        } else if (event.type === "token") {
+          content += event.content;
+          answer.innerHTML = renderMarkdown(content);
+          answer.scrollIntoView({ block: "end" });
+        } else if (event.type === "error") {
+          showError(event.detail);
+        }
+      }
+    }
+  } catch (error) {
+    // Network failures and dropped streams; keep whatever was already received
+    if (content) {
+      answer.insertAdjacentHTML("beforeend", `<p class="error">Error: ${escapeHtml(error.message)}</p>`);
+    } else {
+      showError(error.message);
+    }
+  }
+  loadConversations();
+}
+
+// ---- wiring ----
+
+$("chat-form").addEventListener("submit", (event) => {
+  event.preventDefault();
+  const text = $("prompt").value.trim();
+  if (!text) return;
+  $("prompt").value = "";
+  sendMessage(text);
+});
+$("new-chat").onclick = newChat;
+$("load-older").onclick = loadOlder;
+
+(async () => {
+  try {
+    state.flow = await api("/guided/flow");
+  } catch (error) {
+    state.flow = null;
+  }
+  newChat();
+  loadConversations();
+})();
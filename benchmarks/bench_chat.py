@@ -0,0 +1,81 @@
+"""
+``/chat`` throughput and latency under configurable concurrency.
+
+Requests go through the real FastAPI app in-process (no network) with the
+local LLM and embedding stand-ins.
+"""
+import asyncio
+import time
+from typing import Dict, List
+import httpx
+from backend.core.config import settings
+from backend.main import app
+from backend.db.session import init_db
+from backend.rag.ingestion import load_documents, split_documents
+from backend.rag.retriever import add_documents_to_vectorstore
+from benchmarks.common import measure, percentiles
+
+
+async def _worker(client: httpx.AsyncClient, queue: asyncio.Queue, samples: List[float], errors: List[int]) -> None:
+    while True:
+        try:
+            question = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        response = await client.post("/api/v1/chat", json={"message": question, "use_history": False})
+        if response.status_code == 200:
+            samples.append(time.perf_counter() - start)
+        else:
+            errors.append(response.status_code)
+
+
+async def _load(concurrency: int, requests: int, unique: bool) -> Dict:
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        # Unique questions defeat request coalescing; repeated ones exercise it.
+        # The level is part of every question so no level reuses another's answers.
+        question = f"What does a Lasting Power of Attorney cover? [c{concurrency}]"
+        queue.put_nowait(f"{question} ({i})" if unique else question)
+
+    samples: List[float] = []
+    errors: List[int] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[_worker(client, queue, samples, errors) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(samples) / elapsed if elapsed else None,
+        "latency": percentiles(samples),
+    }
+
+
+def run(documents_path: str, concurrency_levels: List[int], requests: int, unique: bool) -> Dict:
+    """
+    Benchmark the chat endpoint.
+
+    Args:
+        documents_path: Directory with the documents to index first.
+        concurrency_levels: Number of concurrent clients for each run.
+        requests: Requests per run.
+        unique: Whether every request asks a different question.
+
+    Returns:
+        Benchmark results keyed by concurrency level.
+    """
+    # Answers served from the cache would measure the cache, not the pipeline
+    settings.answer_cache_enabled = False
+    init_db()
+    add_documents_to_vectorstore(split_documents(load_documents(documents_path)))
+
+    results = {}
+    for concurrency in concurrency_levels:
+        with measure(trace_python=False) as stats:
+            run_result = asyncio.run(_load(concurrency, requests, unique))
+        results[str(concurrency)] = {**run_result, "max_rss_mb": stats["max_rss_mb"]}
+    return results
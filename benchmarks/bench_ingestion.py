@@ -0,0 +1,76 @@
+"""
+Ingestion throughput over ``data/documents`` and a synthetic scaled corpus.
+"""
+import os
+from typing import Dict, List
+from langchain_core.documents import Document
+from backend.core.config import settings
+from backend.rag.ingestion import load_documents, split_documents
+from backend.rag.retriever import get_vectorstore
+from benchmarks.common import measure
+
+
+def scale_corpus(documents: List[Document], factor: int) -> List[Document]:
+    """
+    Replicate documents ``factor`` times with distinct sources.
+
+    The copies are near duplicates of each other, so the scaled corpora are
+    ingested with deduplication disabled (see :func:`ingest`).
+    """
+    scaled = []
+    for copy in range(factor):
+        for doc in documents:
+            metadata = dict(doc.metadata)
+            metadata["source"] = f"{metadata.get('source', 'synthetic')}#copy{copy}"
+            scaled.append(Document(page_content=f"{doc.page_content}\n(copy {copy})", metadata=metadata))
+    return scaled
+
+
+def ingest(documents: List[Document], persist_directory: str, deduplicate: bool | None = None) -> Dict:
+    with measure() as split_stats:
+        chunks = split_documents(documents, deduplicate=deduplicate)
+
+    with measure() as index_stats:
+        vectorstore = get_vectorstore(persist_directory)
+        vectorstore.add_documents(chunks)
+
+    return {
+        "documents": len(documents),
+        "chunks": len(chunks),
+        "split": split_stats,
+        "index": index_stats,
+        "split_chunks_per_second": len(chunks) / split_stats["seconds"] if split_stats["seconds"] else None,
+        "index_chunks_per_second": len(chunks) / index_stats["seconds"] if index_stats["seconds"] else None,
+    }
+
+
+def run(documents_path: str, scale_factors: List[int]) -> Dict:
+    """
+    Benchmark loading, splitting and indexing.
+
+    Args:
+        documents_path: Directory with the source documents.
+        scale_factors: Replication factors for the synthetic corpus.
+
+    Returns:
+        Benchmark results.
+    """
+    with measure() as load_stats:
+        documents = load_documents(documents_path)
+
+    results = {
+        "load": {"documents": len(documents), **load_stats},
+        "corpus": ingest(documents, os.path.join(settings.chroma_db_path, "ingest_base")),
+        "scaled": {},
+    }
+
+    for factor in scale_factors:
+        scaled = scale_corpus(documents, factor)
+        results["scaled"][str(factor)] = ingest(
+            scaled,
+            os.path.join(settings.chroma_db_path, f"ingest_x{factor}"),
+            # Deduplication would fold the copies back into one corpus
+            deduplicate=False
+        )
+
+    return results
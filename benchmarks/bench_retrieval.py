@@ -0,0 +1,67 @@
+"""
+``similarity_search`` latency as a function of corpus size and k.
+"""
+import os
+import random
+import time
+from typing import Dict, List
+from langchain_core.documents import Document
+from backend.core.config import settings
+from backend.rag.retriever import get_vectorstore, similarity_search
+from benchmarks.common import measure, percentiles
+
+
+VOCABULARY = (
+    "will", "probate", "executor", "estate", "funeral", "lpa", "attorney", "trust",
+    "inheritance", "document", "legacy", "grief", "bereavement", "property", "finance",
+    "health", "welfare", "digital", "account", "message", "solicitor", "fee", "support",
+)
+
+
+def synthetic_chunks(count: int, seed: int = 0) -> List[Document]:
+    rng = random.Random(seed)
+    return [
+        Document(
+            page_content=" ".join(rng.choices(VOCABULARY, k=80)),
+            metadata={"source": f"synthetic_{i // 50}.txt", "source_name": f"synthetic_{i // 50}.txt", "category": "general"},
+        )
+        for i in range(count)
+    ]
+
+
+def run(corpus_sizes: List[int], k_values: List[int], queries: int) -> Dict:
+    """
+    Benchmark search latency.
+
+    Args:
+        corpus_sizes: Number of chunks in each benchmark collection.
+        k_values: Result counts to search with.
+        queries: Queries per (size, k) combination.
+
+    Returns:
+        Benchmark results keyed by corpus size and k.
+    """
+    rng = random.Random(1)
+    questions = [" ".join(rng.choices(VOCABULARY, k=8)) for _ in range(queries)]
+    results = {}
+    original_path = settings.chroma_db_path
+
+    for size in corpus_sizes:
+        settings.chroma_db_path = os.path.join(original_path, f"search_{size}")
+        chunks = synthetic_chunks(size)
+        vectorstore = get_vectorstore()
+        for start in range(0, len(chunks), 5000):
+            vectorstore.add_documents(chunks[start:start + 5000])
+
+        results[str(size)] = {}
+        for k in k_values:
+            samples = []
+            with measure(trace_python=False) as stats:
+                for question in questions:
+                    start = time.perf_counter()
+                    similarity_search(question, k=k)
+                    samples.append(time.perf_counter() - start)
+            results[str(size)][str(k)] = {"latency": percentiles(samples), **stats}
+
+    settings.chroma_db_path = original_path
+    return results
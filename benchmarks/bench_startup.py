@@ -0,0 +1,57 @@
+"""
+Cold-start time of the API: module import, serving and readiness.
+
+Each run boots ``backend.main`` in a fresh interpreter (as an autoscaled pod
+would) and drives its lifespan until ``/ready`` would report ready.
+"""
+import json
+import subprocess
+import sys
+from typing import Dict
+from benchmarks.common import percentiles
+
+
+BOOT_SCRIPT = """
+import asyncio, json, time
+start = time.perf_counter()
+import backend.main as main
+imported = time.perf_counter()
+
+async def boot():
+    async with main.app.router.lifespan_context(main.app):
+        started = time.perf_counter()
+        while not main.app.state.ready:
+            if time.perf_counter() - started > {timeout}:
+                raise TimeoutError("app did not become ready")
+            await asyncio.sleep(0.005)
+        return started, time.perf_counter()
+
+started, ready = asyncio.run(boot())
+print(json.dumps({{"import": imported - start, "started": started - start, "ready": ready - start}}))
+"""
+
+
+def boot_once(timeout: float) -> Dict[str, float]:
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT_SCRIPT.format(timeout=timeout)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int, timeout: float = 60.0) -> Dict:
+    """
+    Benchmark cold starts.
+
+    Args:
+        runs: Number of fresh interpreters to boot.
+        timeout: Seconds to wait for readiness in each run.
+
+    Returns:
+        Percentiles of import, serving and readiness times.
+    """
+    samples = [boot_once(timeout) for _ in range(runs)]
+    return {
+        phase: percentiles([sample[phase] for sample in samples])
+        for phase in ("import", "started", "ready")
+    }
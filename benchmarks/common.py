@@ -0,0 +1,102 @@
+"""
+Shared helpers for the offline benchmarks.
+
+``configure_offline`` must run before any ``backend`` module is imported so
+that settings pick up the local LLM and embedding stand-ins, a throwaway
+SQLite database, a temporary ChromaDB directory and empty caches. The answer,
+embedding and PDF page caches are disabled or kept under the working
+directory, so a run never times cache hits left behind by an earlier one.
+"""
+import os
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+def configure_offline(work_dir: str | None = None) -> str:
+    """
+    Point the backend at offline stand-ins and temporary storage.
+
+    Args:
+        work_dir: Directory for the database, vector stores and caches; a temp
+            dir by default, created when it does not exist.
+
+    Returns:
+        The working directory used.
+    """
+    work_dir = work_dir or tempfile.mkdtemp(prefix="rag-bench-")
+    os.makedirs(work_dir, exist_ok=True)
+    os.environ["LLM_PROVIDER"] = "local"
+    os.environ["EMBEDDING_PROVIDER"] = "local"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir, 'bench.db')}"
+    os.environ["CHROMA_DB_PATH"] = os.path.join(work_dir, "chroma")
+    os.environ["OPENAI_API_KEY"] = "offline"
+    os.environ["ANSWER_CACHE_ENABLED"] = "false"
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+    os.environ["CACHE_SQLITE_PATH"] = os.path.join(work_dir, "cache.sqlite3")
+    os.environ["PDF_CACHE_PATH"] = os.path.join(work_dir, "pdf_cache.sqlite3")
+    return work_dir
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples (seconds) in milliseconds.
+    """
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+@contextmanager
+def measure(trace_python: bool = True):
+    """
+    Measure wall time and memory high-water marks of a block.
+
+    Yields a dict filled in with ``seconds``, ``python_peak_mb`` (tracemalloc
+    peak, only when ``trace_python`` is set since tracing slows the block down)
+    and ``max_rss_mb`` (process high-water mark) when the block exits.
+    """
+    result: Dict[str, float] = {}
+    if trace_python:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+        if trace_python:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["python_peak_mb"] = peak / 1024 / 1024
+        # ru_maxrss is reported in kilobytes on Linux
+        result["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def git_commit() -> str:
+    """
+    Get the current commit hash, or "unknown" outside a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
@@ -0,0 +1,186 @@
+"""
+Retrieval quality and latency evaluation over a golden question set.
+
+Every combination of chunk size, chunk overlap, separators and k is scored
+with recall@k, MRR, the number of context tokens sent to the LLM and the
+retrieval latency. Chunking configurations are evaluated in parallel worker
+processes, each with its own in-memory ChromaDB collection.
+
+    python -m benchmarks.eval_retrieval --embeddings openai --output bench_results/eval.json
+
+Use ``--embeddings local`` for an offline smoke run (scores are then not
+meaningful, only latency and token counts are).
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+
+GOLDEN_SET_PATH = os.path.join(os.path.dirname(__file__), "golden_questions.json")
+
+# "default" (None) uses the configured splitter (structure-aware unless
+# TEXT_SPLITTER=recursive); the other presets use the character splitter
+SEPARATOR_PRESETS = {
+    "default": None,
+    "paragraph": ["\n\n", "\n", " ", ""],
+    "sentence": [". ", "? ", "! ", "\n", " ", ""],
+}
+
+
+def count_tokens(text: str) -> int:
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    except Exception:
+        # Rough fallback: about four characters per token
+        return len(text) // 4
+
+
+def is_relevant(metadata: Dict, expected: List[Dict]) -> bool:
+    source = os.path.basename(metadata.get("source", ""))
+    return any(source == e["source"] and metadata.get("page") == e["page"] for e in expected)
+
+
+def evaluate_config(job: Dict) -> List[Dict]:
+    """
+    Score one chunking configuration for every k (runs in a worker process).
+    """
+    from langchain_chroma import Chroma
+    from backend.rag.ingestion import load_documents, split_documents
+    from backend.rag.retriever import get_embeddings
+
+    documents = load_documents(job["documents_path"])
+    chunks = split_documents(
+        documents,
+        chunk_size=job["chunk_size"],
+        chunk_overlap=job["chunk_overlap"],
+        separators=SEPARATOR_PRESETS[job["separators"]],
+    )
+
+    vectorstore = Chroma(
+        collection_name=f"eval_{uuid.uuid4().hex}",
+        embedding_function=get_embeddings(),
+    )
+    vectorstore.add_documents(chunks)
+
+    max_k = max(job["k_values"])
+    retrieved = []
+    latencies = []
+    for item in job["golden"]:
+        start = time.perf_counter()
+        docs = vectorstore.similarity_search(item["question"], k=max_k)
+        latencies.append(time.perf_counter() - start)
+        retrieved.append(docs)
+
+    latencies.sort()
+    results = []
+    for k in job["k_values"]:
+        hits = 0
+        reciprocal_ranks = 0.0
+        tokens = 0
+        for item, docs in zip(job["golden"], retrieved):
+            top = docs[:k]
+            tokens += count_tokens("\n\n".join(d.page_content for d in top))
+            for rank, doc in enumerate(top, start=1):
+                if is_relevant(doc.metadata, item["expected"]):
+                    hits += 1
+                    reciprocal_ranks += 1 / rank
+                    break
+
+        questions = len(job["golden"])
+        results.append({
+            "chunk_size": job["chunk_size"],
+            "chunk_overlap": job["chunk_overlap"],
+            "separators": job["separators"],
+            "k": k,
+            "chunks": len(chunks),
+            "recall_at_k": hits / questions,
+            "mrr": reciprocal_ranks / questions,
+            "avg_context_tokens": tokens / questions,
+            "latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+            "latency_p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        })
+
+    vectorstore.delete_collection()
+    return results
+
+
+def recommend(results: List[Dict], tolerance: float) -> Dict:
+    """
+    Pick the configuration with the fewest context tokens whose recall is
+    within ``tolerance`` of the best recall observed.
+    """
+    best_recall = max(r["recall_at_k"] for r in results)
+    candidates = [r for r in results if r["recall_at_k"] >= best_recall - tolerance]
+    return min(candidates, key=lambda r: (r["avg_context_tokens"], -r["mrr"]))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Evaluate chunking/retrieval configurations.")
+    parser.add_argument("--golden", default=GOLDEN_SET_PATH)
+    parser.add_argument("--documents-path", default="./data/documents")
+    parser.add_argument("--chunk-sizes", nargs="+", type=int, default=[300, 500, 800, 1200])
+    parser.add_argument("--chunk-overlaps", nargs="+", type=int, default=[0, 50, 100, 200])
+    parser.add_argument("--separators", nargs="+", choices=sorted(SEPARATOR_PRESETS), default=sorted(SEPARATOR_PRESETS))
+    parser.add_argument("--k", nargs="+", type=int, default=[3, 5, 8])
+    parser.add_argument("--embeddings", choices=["openai", "local"], default="openai")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Recall loss accepted for fewer tokens")
+    parser.add_argument("--output", default=None, help="JSON file to write (stdout if omitted)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict:
+    args = parse_args(argv)
+    # Read by worker processes when they import the backend settings
+    os.environ["EMBEDDING_PROVIDER"] = args.embeddings
+    os.environ["EMBEDDING_BATCH_ENABLED"] = "false"
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+    with open(args.golden, encoding="utf-8") as f:
+        golden = json.load(f)
+
+    jobs = [
+        {
+            "documents_path": args.documents_path,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "separators": separators,
+            "k_values": args.k,
+            "golden": golden,
+        }
+        for chunk_size, chunk_overlap, separators in itertools.product(
+            args.chunk_sizes, args.chunk_overlaps, args.separators
+        )
+        if chunk_overlap < chunk_size
+    ]
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = [row for rows in executor.map(evaluate_config, jobs) for row in rows]
+
+    results.sort(key=lambda r: (-r["recall_at_k"], r["avg_context_tokens"]))
+    report = {
+        "questions": len(golden),
+        "embeddings": args.embeddings,
+        "recommended": recommend(results, args.tolerance),
+        "results": results,
+    }
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(payload)
+        print(f"Evaluation results written to {args.output}")
+    else:
+        print(payload)
+    return report
+
+
+if __name__ == "__main__":
+    main()
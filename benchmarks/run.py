@@ -0,0 +1,79 @@
+"""
+Offline benchmark harness.
+
+Runs entirely offline with the local LLM and embedding stand-ins and writes
+machine-readable JSON so runs can be compared across commits:
+
+    python -m benchmarks.run --output bench_results/$(git rev-parse --short HEAD).json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from benchmarks.common import configure_offline, git_commit
+
+
+SUITES = ("ingestion", "retrieval", "chat", "startup")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run offline RAG benchmarks.")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--documents-path", default="./data/documents")
+    parser.add_argument("--scale-factors", nargs="+", type=int, default=[10, 50])
+    parser.add_argument("--corpus-sizes", nargs="+", type=int, default=[1000, 10000])
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 5, 20])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--repeat-questions", action="store_true", help="Ask the same question to exercise request coalescing (the answer cache stays off)")
+    parser.add_argument("--work-dir", default=None, help="Directory for temporary databases and caches (created if missing)")
+    parser.add_argument("--output", default=None, help="JSON file to write (stdout if omitted)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    work_dir = configure_offline(args.work_dir)
+
+    # Imported after configure_offline so settings see the offline environment
+    from benchmarks import bench_chat, bench_ingestion, bench_retrieval, bench_startup
+
+    results = {}
+    if "ingestion" in args.suites:
+        results["ingestion"] = bench_ingestion.run(args.documents_path, args.scale_factors)
+    if "retrieval" in args.suites:
+        results["retrieval"] = bench_retrieval.run(args.corpus_sizes, args.k, args.queries)
+    if "chat" in args.suites:
+        results["chat"] = bench_chat.run(
+            args.documents_path, args.concurrency, args.requests, not args.repeat_questions
+        )
+    if "startup" in args.suites:
+        results["startup"] = bench_startup.run(args.startup_runs)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "work_dir": work_dir,
+        "arguments": vars(args),
+        "results": results,
+    }
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(payload)
+        print(f"Benchmark results written to {args.output}")
+    else:
+        print(payload)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,331 @@
-import requests
-from config import API_BASE_URL
+import asyncio
+import json
+import threading
+import time
+from typing import AsyncIterator, Iterator
+
+import httpx
+
+from config import (
+    API_BASE_URL,
+    API_TIMEOUT,
+    API_CONNECT_TIMEOUT,
+    API_MAX_CONNECTIONS,
+    API_MAX_RETRIES,
+    API_RETRY_BACKOFF,
+    API_CACHE_TTL,
+    MESSAGE_PAGE_SIZE,
+)
+
+
+# Responses worth retrying: the backend is restarting or overloaded
+RETRY_STATUS_CODES = {502, 503, 504}
+
+# Methods that can be repeated safely after the request may have reached the server
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def client_options(base_url: str) -> dict:
+    """Keep-alive pool and timeout options shared by the sync and async clients."""
+    return {
+        "base_url": base_url,
+        "timeout": httpx.Timeout(API_TIMEOUT, connect=API_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(
+            max_connections=API_MAX_CONNECTIONS,
+            max_keepalive_connections=API_MAX_CONNECTIONS,
+        ),
+    }
+
+
+def should_retry(method: str, attempt: int, error: Exception = None, response: httpx.Response = None) -> bool:
+    """Whether a failed attempt should be repeated."""
+    if attempt >= API_MAX_RETRIES:
+        return False
+    if isinstance(error, httpx.ConnectError | httpx.ConnectTimeout):
+        # Nothing reached the server, so any request can be retried
+        return True
+    if method not in IDEMPOTENT_METHODS:
+        return False
+    if error is not None:
+        return isinstance(error, httpx.TransportError)
+    return response.status_code in RETRY_STATUS_CODES
+
+
+def backoff_delay(attempt: int) -> float:
+    return API_RETRY_BACKOFF * (2 ** attempt)
+
+
+def parse_sse_line(line: str):
+    """Decode one server-sent event line, or None for blank/comment lines."""
+    if not line.startswith("data: "):
+        return None
+    return json.loads(line[len("data: "):])
+
+
+class ResponseCache:
+    """
+    Cache of GET responses shared by every session of the Streamlit process.
+
+    Entries are reused for ``ttl`` seconds, then revalidated with their ETag
+    so unchanged data costs a 304 instead of a full response.
+    """
+
+    def __init__(self, ttl: float = API_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str):
+        """Return ``(fresh, etag, data)`` for a path, or None when not cached."""
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None:
+            return None
+        fetched_at, etag, data = entry
+        return time.monotonic() - fetched_at < self.ttl, etag, data
+
+    def store(self, path: str, etag: str, data):
+        with self._lock:
+            self._entries[path] = (time.monotonic(), etag, data)
+
+    def invalidate(self, *prefixes: str):
+        """Drop every entry whose path starts with one of the prefixes (e.g. all pages of a history)."""
+        with self._lock:
+            for path in [path for path in self._entries if path.startswith(prefixes)]:
+                del self._entries[path]
+
+
+def conditional_headers(cached) -> dict:
+    return {"If-None-Match": cached[1]} if cached and cached[1] else {}
+
+
+def conversation_paths(conversation_id: int = None) -> list:
+    """Cached paths that change when a conversation is written to."""
+    paths = ["/conversations"]
+    if conversation_id is not None:
+        paths.append(f"/chat/{conversation_id}/messages")
+    return paths
 
 
 class ChatClient:
-    """Client for interacting with the chat API."""
+    """Client for interacting with the chat API over a shared keep-alive pool."""
     
     def __init__(self, base_url: str = API_BASE_URL):
         self.base_url = base_url
+        self.http = httpx.Client(**client_options(base_url))
+        self.cache = ResponseCache()
+    
+    def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self.http.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                if not should_retry(method, attempt, error=e):
+                    raise
+            else:
+                if not should_retry(method, attempt, response=response):
+                    return response
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
     
-    def chat(self, message: str, conversation_id: int = None, use_history: bool = True):
-        """Send a chat message."""
-        response = requests.post(
-            f"{self.base_url}/chat",
-            json={
-                "message": message,
-                "conversation_id": conversation_id,
-                "use_history": use_history
-            }
-        )
+    def _request(self, method: str, path: str, **kwargs):
+        response = self._send(method, path, **kwargs)
         response.raise_for_status()
         return response.json()
     
+    def _cached_get(self, path: str):
+        cached = self.cache.get(path)
+        if cached and cached[0]:
+            return cached[2]
+        
+        response = self._send("GET", path, headers=conditional_headers(cached))
+        if response.status_code == 304 and cached:
+            data = cached[2]
+        else:
+            response.raise_for_status()
+            data = response.json()
+        self.cache.store(path, response.headers.get("ETag"), data)
+        return data
+    
+    def close(self):
+        self.http.close()
+    
+    def chat(self, message: str, conversation_id: int = None, use_history: bool = True, filters: dict = None):
+        """Send a chat message, optionally restricting retrieval with metadata filters."""
+        self.cache.invalidate(*conversation_paths(conversation_id))
+        return self._request("POST", "/chat", json={
+            "message": message,
+            "conversation_id": conversation_id,
+            "use_history": use_history,
+            "filters": filters
+        })
+    
+    def stream_chat(
+        self, message: str, conversation_id: int = None, use_history: bool = True, filters: dict = None
+    ) -> Iterator[dict]:
+        """Send a chat message and yield the server-sent events (conversation, token, done, error)."""
+        payload = {
+            "message": message,
+            "conversation_id": conversation_id,
+            "use_history": use_history,
+            "filters": filters
+        }
+        self.cache.invalidate(*conversation_paths(conversation_id))
+        with self.http.stream("POST", "/chat/stream", json=payload) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                event = parse_sse_line(line)
+                if event is not None:
+                    yield event
+        # The exchange is persisted when the stream ends
+        self.cache.invalidate(*conversation_paths(conversation_id))
+    
     def get_messages(self, conversation_id: int):
-        """Get messages for a conversation."""
-        response = requests.get(f"{self.base_url}/chat/{conversation_id}/messages")
-        response.raise_for_status()
-        return response.json()
+        """Get messages for a conversation (cached, revalidated with its ETag)."""
+        return self._cached_get(f"/chat/{conversation_id}/messages")
+    
+    def get_message_page(self, conversation_id: int, before_id: int = None, limit: int = MESSAGE_PAGE_SIZE):
+        """Get the latest page of messages, or the page before ``before_id`` (cached)."""
+        path = f"/chat/{conversation_id}/messages/page?limit={limit}"
+        if before_id is not None:
+            path += f"&before_id={before_id}"
+        return self._cached_get(path)
     
     def create_conversation(self, title: str = None):
         """Create a new conversation."""
-        response = requests.post(
-            f"{self.base_url}/conversations",
-            json={"title": title} if title else None
-        )
+        self.cache.invalidate(*conversation_paths())
+        return self._request("POST", "/conversations", json={"title": title} if title else None)
+    
+    def list_conversations(self):
+        """List all conversations (cached, revalidated with its ETag)."""
+        return self._cached_get("/conversations")
+    
+    def delete_conversation(self, conversation_id: int):
+        """Delete a conversation."""
+        self.cache.invalidate(*conversation_paths(conversation_id))
+        return self._request("DELETE", f"/conversations/{conversation_id}")
+
+    def get_guided_flow(self):
+        """Get the compiled guided-flow graph."""
+        return self._cached_get("/guided/flow")
+
+    def get_guided_answer(self, key: str):
+        """Get the precomputed answer for a guided-flow option, or None if it is not available."""
+        response = self._send("GET", f"/guided/answers/{key}")
+        if response.status_code == 404:
+            return None
         response.raise_for_status()
         return response.json()
+
+
+class AsyncChatClient:
+    """Async variant of ChatClient, for callers running their own event loop."""
     
-    def list_conversations(self):
-        """List all conversations."""
-        response = requests.get(f"{self.base_url}/conversations")
+    def __init__(self, base_url: str = API_BASE_URL):
+        self.base_url = base_url
+        self.http = httpx.AsyncClient(**client_options(base_url))
+        self.cache = ResponseCache()
+    
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self.http.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                if not should_retry(method, attempt, error=e):
+                    raise
+            else:
+                if not should_retry(method, attempt, response=response):
+                    return response
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+    
+    async def _request(self, method: str, path: str, **kwargs):
+        response = await self._send(method, path, **kwargs)
         response.raise_for_status()
         return response.json()
     
-    def delete_conversation(self, conversation_id: int):
+    async def _cached_get(self, path: str):
+        cached = self.cache.get(path)
+        if cached and cached[0]:
+            return cached[2]
+        
+        response = await self._send("GET", path, headers=conditional_headers(cached))
+        if response.status_code == 304 and cached:
+            data = cached[2]
+        else:
+            response.raise_for_status()
+            data = response.json()
+        self.cache.store(path, response.headers.get("ETag"), data)
+        return data
+    
+    async def close(self):
+        await self.http.aclose()
+    
+    async def chat(self, message: str, conversation_id: int = None, use_history: bool = True, filters: dict = None):
+        """Send a chat message, optionally restricting retrieval with metadata filters."""
+        self.cache.invalidate(*conversation_paths(conversation_id))
+        return await self._request("POST", "/chat", json={
+            "message": message,
+            "conversation_id": conversation_id,
+            "use_history": use_history,
+            "filters": filters
+        })
+    
+    async def stream_chat(
+        self, message: str, conversation_id: int = None, use_history: bool = True, filters: dict = None
+    ) -> AsyncIterator[dict]:
+        """Send a chat message and yield the server-sent events as they arrive."""
+        payload = {
+            "message": message,
+            "conversation_id": conversation_id,
+            "use_history": use_history,
+            "filters": filters
+        }
+        self.cache.invalidate(*conversation_paths(conversation_id))
+        async with self.http.stream("POST", "/chat/stream", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                event = parse_sse_line(line)
+                if event is not None:
+                    yield event
+        # The exchange is persisted when the stream ends
+        self.cache.invalidate(*conversation_paths(conversation_id))
+    
+    async def get_messages(self, conversation_id: int):
+        """Get messages for a conversation (cached, revalidated with its ETag)."""
+        return await self._cached_get(f"/chat/{conversation_id}/messages")
+    
+    async def get_message_page(self, conversation_id: int, before_id: int = None, limit: int = MESSAGE_PAGE_SIZE):
+        """Get the latest page of messages, or the page before ``before_id`` (cached)."""
+        path = f"/chat/{conversation_id}/messages/page?limit={limit}"
+        if before_id is not None:
+            path += f"&before_id={before_id}"
+        return await self._cached_get(path)
+    
+    async def create_conversation(self, title: str = None):
+        """Create a new conversation."""
+        self.cache.invalidate(*conversation_paths())
+        return await self._request("POST", "/conversations", json={"title": title} if title else None)
+    
+    async def list_conversations(self):
+        """List all conversations (cached, revalidated with its ETag)."""
+        return await self._cached_get("/conversations")
+    
+    async def delete_conversation(self, conversation_id: int):
         """Delete a conversation."""
-        response = requests.delete(f"{self.base_url}/conversations/{conversation_id}")
+        self.cache.invalidate(*conversation_paths(conversation_id))
+        return await self._request("DELETE", f"/conversations/{conversation_id}")
+
+    async def get_guided_flow(self):
+        """Get the compiled guided-flow graph."""
+        return await self._cached_get("/guided/flow")
+
+    async def get_guided_answer(self, key: str):
+        """Get the precomputed answer for a guided-flow option, or None if it is not available."""
+        response = await self._send("GET", f"/guided/answers/{key}")
+        if response.status_code == 404:
+            return None
         response.raise_for_status()
         return response.json()
-
@@ -8,6 +8,7 @@ from config import (
     DEFAULT_GUIDED_STEP,
     DEFAULT_CONVERSATION_MODE,
     RECENT_CONVERSATIONS_LIMIT,
+    MESSAGE_PAGE_SIZE,
 )
 from api.client import ChatClient
 from ui.guided_flow import render_guided_flow
@@ -18,10 +19,16 @@ from utils.helpers import (
 )
 
 
+@st.cache_resource
+def get_client() -> ChatClient:
+    """One pooled client per Streamlit server process, shared by all sessions and reruns."""
+    return ChatClient()
+
+
 def initialize_session_state():
     """Initialize all session state variables."""
     if "client" not in st.session_state:
-        st.session_state.client = ChatClient()
+        st.session_state.client = get_client()
 
     if "conversation_id" not in st.session_state:
         st.session_state.conversation_id = None
@@ -38,6 +45,16 @@ def initialize_session_state():
     if "conversation_mode" not in st.session_state:
         st.session_state.conversation_mode = DEFAULT_CONVERSATION_MODE
 
+    if "search_filters" not in st.session_state:
+        st.session_state.search_filters = None
+
+    # History paging: cursor for the next older page, and how many recent messages are shown
+    if "older_before_id" not in st.session_state:
+        st.session_state.older_before_id = None
+
+    if "visible_messages" not in st.session_state:
+        st.session_state.visible_messages = MESSAGE_PAGE_SIZE
+
 
 def render_sidebar():
     """Render the sidebar with conversation management."""
@@ -67,7 +84,8 @@ def render_sidebar():
                         use_container_width=True
                     ):
                         st.session_state.conversation_id = conv["id"]
-                        st.session_state.messages = st.session_state.client.get_messages(conv["id"])
+                        st.session_state.search_filters = None
+                        load_latest_messages(conv["id"])
                         st.session_state.conversation_mode = "chat"
                         st.session_state.guided_flow_active = False
                         st.rerun()
@@ -77,9 +95,39 @@ def render_sidebar():
         st.markdown("---")
 
 
+def load_latest_messages(conversation_id: int):
+    """Load only the most recent page of a conversation's history."""
+    page = st.session_state.client.get_message_page(conversation_id)
+    st.session_state.messages = page["messages"]
+    st.session_state.older_before_id = page["next_before_id"] if page["has_more"] else None
+    st.session_state.visible_messages = MESSAGE_PAGE_SIZE
+
+
+def show_older_messages():
+    """Reveal one more page of history, fetching it from the backend when not loaded yet."""
+    hidden = len(st.session_state.messages) - st.session_state.visible_messages
+    if hidden < MESSAGE_PAGE_SIZE and st.session_state.older_before_id is not None:
+        page = st.session_state.client.get_message_page(
+            st.session_state.conversation_id,
+            before_id=st.session_state.older_before_id
+        )
+        st.session_state.messages = page["messages"] + st.session_state.messages
+        st.session_state.older_before_id = page["next_before_id"] if page["has_more"] else None
+    st.session_state.visible_messages += MESSAGE_PAGE_SIZE
+
+
 def render_chat_messages():
-    """Render all chat messages."""
-    for message in st.session_state.messages:
+    """Render the most recent window of chat messages.
+
+    Only ``visible_messages`` messages are rendered, so the cost of a rerun
+    does not grow with the length of the conversation.
+    """
+    messages = st.session_state.messages
+    visible = st.session_state.visible_messages
+    if len(messages) > visible or st.session_state.older_before_id is not None:
+        st.button("⬆️ Load older messages", on_click=show_older_messages, key="load_older_messages")
+
+    for message in messages[-visible:]:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
@@ -94,30 +142,36 @@ def handle_chat_input(prompt: str):
     with st.chat_message("user"):
         st.markdown(prompt)
     
-    # Get assistant response
+    # Stream the assistant response as it is generated
     with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            try:
-                # Create conversation on first message
-                if st.session_state.conversation_id is None:
-                    title = generate_title_from_message(prompt)
-                    conversation = st.session_state.client.create_conversation(title=title)
-                    st.session_state.conversation_id = conversation["id"]
-                    
-                response = st.session_state.client.chat(
-                    message=prompt,
-                    conversation_id=st.session_state.conversation_id
-                )
-                
-                answer = response["answer"]
-                st.session_state.messages.append({"role": "assistant", "content": answer})
-                st.markdown(answer)
-                
-                # Update conversation ID
-                st.session_state.conversation_id = response["conversation_id"]
-                
-            except Exception as e:
-                st.error(f"Error: {e}")
+        try:
+            # Create conversation on first message
+            if st.session_state.conversation_id is None:
+                title = generate_title_from_message(prompt)
+                conversation = st.session_state.client.create_conversation(title=title)
+                st.session_state.conversation_id = conversation["id"]
+
+            events = st.session_state.client.stream_chat(
+                message=prompt,
+                conversation_id=st.session_state.conversation_id,
+                filters=st.session_state.search_filters
+            )
+
+            def tokens():
+                for event in events:
+                    if event["type"] == "token":
+                        yield event["content"]
+                    elif event["type"] == "error":
+                        raise RuntimeError(event["detail"])
+                    elif event["type"] == "conversation":
+                        # Update conversation ID
+                        st.session_state.conversation_id = event["conversation_id"]
+
+            answer = st.write_stream(tokens())
+            st.session_state.messages.append({"role": "assistant", "content": answer})
+
+        except Exception as e:
+            st.error(f"Error: {e}")
 
 
 def main():
@@ -150,7 +204,6 @@ def main():
     render_chat_messages()
 
     # Render guided flow
-    st.session_state.client = ChatClient()  # Ensure client is available
     render_guided_flow()
 
     # Chat input
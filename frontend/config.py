@@ -1,5 +1,11 @@
 # API Configuration
 API_BASE_URL = "http://localhost:8000/api/v1"
+API_TIMEOUT = 60.0  # seconds; chat answers can take a while
+API_CONNECT_TIMEOUT = 5.0
+API_MAX_CONNECTIONS = 20
+API_MAX_RETRIES = 3
+API_RETRY_BACKOFF = 0.5  # seconds, doubled on every retry
+API_CACHE_TTL = 10.0  # seconds a cached list/history is reused before revalidating with its ETag
 
 # Page Configuration
 PAGE_TITLE = "Toolboxx Chat Bot"
@@ -11,7 +17,11 @@ INITIAL_SIDEBAR_STATE = "expanded"
 DEFAULT_GUIDED_STEP = "root"
 DEFAULT_CONVERSATION_MODE = "guided"
 
+# Chunks not tied to a single guided-flow category stay searchable in every category
+GENERAL_CATEGORY = "general"
+
 # UI Configuration
 MAX_TITLE_WORDS = 8
 RECENT_CONVERSATIONS_LIMIT = 5
+MESSAGE_PAGE_SIZE = 30  # messages loaded and rendered per page of history
 
@@ -1,23 +1,12 @@
 import streamlit as st
-from ui.components import (
-    render_root_options,
-    render_final_wishes_options,
-    render_bereavement_options,
-    render_legal_options,
-    render_lpa_mode_options,
-    render_will_mode_options,
-)
+from api.client import ChatClient
+from ui.components import render_step
 
 
-# Guided flow step mapping
-GUIDED_FLOW_STEPS = {
-    "root": render_root_options,
-    "final_wishes": render_final_wishes_options,
-    "breavement": render_bereavement_options,
-    "legal": render_legal_options,
-    "lpa_mode": render_lpa_mode_options,
-    "will_mode": render_will_mode_options,
-}
+@st.cache_resource
+def load_guided_flow(_client: ChatClient) -> dict:
+    """Fetch the compiled guided flow once per Streamlit server process."""
+    return _client.get_guided_flow()
 
 
 def render_guided_flow():
@@ -25,15 +14,16 @@ def render_guided_flow():
     if not st.session_state.guided_flow_active:
         return
     
-    current_step = st.session_state.guided_step
+    try:
+        flow = load_guided_flow(st.session_state.client)
+    except Exception:
+        st.warning("Guided options are unavailable right now")
+        return
     
-    # Get the appropriate render function for the current step
-    render_function = GUIDED_FLOW_STEPS.get(current_step)
+    step = flow["steps"].get(st.session_state.guided_step)
+    if step is None:
+        # Default to the start step if the current one is unknown
+        st.session_state.guided_step = flow["start"]
+        step = flow["steps"][flow["start"]]
     
-    if render_function:
-        render_function()
-    else:
-        # Default to root if step is unknown
-        st.session_state.guided_step = "root"
-        render_root_options()
-
+    render_step(step)
@@ -1,5 +1,5 @@
 import streamlit as st
-from config import MAX_TITLE_WORDS
+from config import MAX_TITLE_WORDS, GENERAL_CATEGORY, MESSAGE_PAGE_SIZE
 
 
 def generate_title_from_message(message: str) -> str:
@@ -21,10 +21,18 @@ def init_guided_greeting():
         })
 
 
+def set_search_category(category: str):
+    """Restrict chat retrieval to a guided-flow category (plus general content)."""
+    st.session_state.search_filters = {"category": [category, GENERAL_CATEGORY]}
+
+
 def reset_conversation():
     """Reset conversation state to start fresh."""
     st.session_state.conversation_id = None
+    st.session_state.search_filters = None
     st.session_state.messages = []
+    st.session_state.older_before_id = None
+    st.session_state.visible_messages = MESSAGE_PAGE_SIZE
     st.session_state.guided_flow_active = True
     st.session_state.guided_step = "root"
     st.session_state.conversation_mode = "guided"
@@ -0,0 +1,46 @@
+"""
+Shared test setup.
+
+The settings are read from the environment when ``backend`` is first
+imported, so an in-memory database and the offline LLM and embedding
+providers are configured here, before any test module imports the app.
+"""
+import os
+import tempfile
+
+# A file rather than ":memory:" so every pooled connection sees the same tables
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='rag-tests-'), 'test.db')}"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["LLM_PROVIDER"] = "local"
+os.environ["EMBEDDING_PROVIDER"] = "local"
+os.environ["CACHE_BACKEND"] = "memory"
+
+import httpx
+import pytest
+from backend.core.config import settings
+
+
+@pytest.fixture
+def anyio_backend():
+    # Async tests run on asyncio through the anyio pytest plugin
+    return "asyncio"
+
+
+@pytest.fixture
+def chroma_path(tmp_path, monkeypatch):
+    """Point the vector store, and everything stored next to it, at a fresh directory."""
+    path = str(tmp_path / "chroma")
+    monkeypatch.setattr(settings, "chroma_db_path", path)
+    return path
+
+
+@pytest.fixture
+async def client(chroma_path):
+    """HTTP client for the app, with tables created and an empty vector store."""
+    from backend.db.session import init_db
+    from backend.main import app
+
+    init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http_client:
+        yield http_client
@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from langchain_core.embeddings import Embeddings
+from backend.rag.batching import BatchingEmbeddings
+
+
+class RecordingEmbeddings(Embeddings):
+    """Embeds a text as its length, recording every batch call."""
+
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("embedding API down")
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text):
+        raise AssertionError("queries must be embedded in batches")
+
+
+def embed_concurrently(embeddings: Embeddings, texts):
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        return list(executor.map(embeddings.embed_query, texts))
+
+
+def test_concurrent_queries_share_one_batch_call():
+    inner = RecordingEmbeddings()
+    batching = BatchingEmbeddings(inner, window_ms=300)
+    texts = [f"question {'?' * i}" for i in range(8)]
+
+    vectors = embed_concurrently(batching, texts)
+
+    assert vectors == [[float(len(text))] for text in texts]
+    assert len(inner.calls) == 1
+    assert sorted(inner.calls[0]) == sorted(texts)
+    assert (batching.query_count, batching.batch_count) == (8, 1)
+
+
+def test_identical_queries_are_embedded_once():
+    inner = RecordingEmbeddings()
+    batching = BatchingEmbeddings(inner, window_ms=300)
+
+    vectors = embed_concurrently(batching, ["same question"] * 5)
+
+    assert vectors == [[13.0]] * 5
+    assert inner.calls == [["same question"]]
+    assert batching.query_count == 5
+
+
+def test_batches_are_capped_at_the_max_size():
+    inner = RecordingEmbeddings()
+    batching = BatchingEmbeddings(inner, window_ms=300, max_batch_size=3)
+
+    embed_concurrently(batching, [f"q{i}" for i in range(7)])
+
+    assert sorted(len(call) for call in inner.calls) == [1, 3, 3]
+    assert (batching.query_count, batching.batch_count) == (7, 3)
+
+
+def test_batch_errors_reach_every_caller():
+    batching = BatchingEmbeddings(RecordingEmbeddings(fail=True), window_ms=100)
+
+    with pytest.raises(RuntimeError, match="embedding API down"):
+        embed_concurrently(batching, ["a", "b"])
+    assert batching.batch_count == 0
+
+
+def test_documents_pass_straight_through():
+    inner = RecordingEmbeddings()
+    batching = BatchingEmbeddings(inner)
+
+    assert batching.embed_documents(["ab", "abc"]) == [[2.0], [3.0]]
+    assert inner.calls == [["ab", "abc"]]
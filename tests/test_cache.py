@@ -0,0 +1,117 @@
+import fnmatch
+import time
+import pytest
+from backend.core.cache import InProcessCache, RedisCache, SQLiteCache
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the redis client used by RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def _live(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def get(self, key):
+        value = self._live(key)
+        return value.encode("utf-8") if value is not None else None
+
+    def set(self, key, value, px=None):
+        self.data[key] = (value, time.monotonic() + px / 1000 if px else None)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return InProcessCache(max_entries=100)
+    if request.param == "sqlite":
+        return SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=100)
+    return RedisCache(client=FakeRedis(), prefix="test:")
+
+
+def test_values_round_trip_as_json(cache):
+    cache.set("answer", "Probate proves a will.")
+    cache.set("vector", [0.5, -1.0])
+    cache.set("flag", True)
+
+    assert cache.get("answer") == "Probate proves a will."
+    assert cache.get("vector") == [0.5, -1.0]
+    assert cache.get("flag") is True
+    assert cache.get("missing") is None
+
+
+def test_entries_expire_after_their_ttl(cache):
+    cache.set("short", 1, ttl=0.05)
+    cache.set("long", 2, ttl=60)
+    time.sleep(0.1)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_delete_and_clear(cache):
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.delete("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_redis_clear_only_touches_its_namespace():
+    client = FakeRedis()
+    client.set("other:key", "1")
+    cache = RedisCache(client=client, prefix="rag:")
+    cache.set("key", 1)
+
+    cache.clear()
+
+    assert client.get("other:key") == b"1"
+    assert cache.get("key") is None
+
+
+def test_in_process_cache_evicts_least_recently_used():
+    cache = InProcessCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    SQLiteCache(path).set("key", "from another worker")
+
+    assert SQLiteCache(path).get("key") == "from another worker"
+
+
+def test_sqlite_cache_counts_concurrent_writes_and_evicts(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=10)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: cache.set(f"key{i}", i), range(1000)))
+
+    assert cache._writes == 1000
+    # The 1000th write trimmed the table to the newest entries
+    count = cache._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    assert count <= 10 + 8
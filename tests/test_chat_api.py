@@ -0,0 +1,36 @@
+import pytest
+from backend.db.models import Conversation
+from backend.db.session import SessionLocal
+
+
+pytestmark = pytest.mark.anyio
+
+
+def conversation_count() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(Conversation).count()
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("path", ["/api/v1/chat", "/api/v1/chat/stream"])
+async def test_invalid_filters_are_rejected_before_a_conversation_is_created(client, path):
+    before = conversation_count()
+
+    response = await client.post(path, json={"message": "What is probate?", "filters": {"page": "3"}})
+
+    assert response.status_code == 400
+    assert conversation_count() == before
+
+
+async def test_chat_titles_new_conversations_after_the_message(client):
+    response = await client.post("/api/v1/chat", json={"message": "What happens to a will after someone dies abroad?"})
+
+    assert response.status_code == 200
+    db = SessionLocal()
+    try:
+        conversation = db.get(Conversation, response.json()["conversation_id"])
+        assert conversation.title == "What happens to a will after someone dies..."
+    finally:
+        db.close()
@@ -0,0 +1,80 @@
+import pytest
+from langchain_core.documents import Document
+from backend.rag.dedup import deduplicate_chunks, figures, normalize, simhash
+
+
+CLAUSE = (
+    "The executor must collect the assets of the estate, pay any debts and taxes that are "
+    "owed, and then distribute what remains to the beneficiaries named in the will. The "
+    "executor should keep a full record of every payment made from the estate account and "
+    "provide the beneficiaries with final accounts once the administration is complete, "
+    "including a statement of the fee of 250 pounds charged for the probate application."
+)
+
+
+def chunk(text: str, source: str, category: str = "wills") -> Document:
+    return Document(page_content=text, metadata={"category": category, "source_name": source})
+
+
+def distance(a: str, b: str) -> int:
+    return bin(simhash(normalize(a)) ^ simhash(normalize(b))).count("1")
+
+
+def test_exact_duplicates_are_merged_ignoring_formatting():
+    chunks = [chunk(CLAUSE, "a.pdf"), chunk(f"  - {CLAUSE.upper()}  ", "b.pdf")]
+
+    survivors = deduplicate_chunks(chunks, max_distance=0)
+
+    assert survivors == [chunks[0]]
+    assert survivors[0].metadata["merged_sources"] == "b.pdf"
+    assert survivors[0].metadata["duplicate_count"] == 1
+
+
+def test_near_duplicates_are_merged():
+    reworded = CLAUSE.replace("keep a full record", "keep a complete record")
+    assert 0 < distance(CLAUSE, reworded) <= 15
+
+    survivors = deduplicate_chunks([chunk(CLAUSE, "a.pdf"), chunk(reworded, "b.pdf")], max_distance=15)
+
+    assert len(survivors) == 1
+    assert survivors[0].metadata["merged_sources"] == "b.pdf"
+
+
+@pytest.mark.parametrize("changed", [
+    CLAUSE.replace("250 pounds", "275 pounds"),
+    CLAUSE.replace("250 pounds", "2.5% of the estate"),
+    CLAUSE + " Claims must be made within 14 days.",
+])
+def test_near_duplicates_with_different_figures_are_kept(changed):
+    assert distance(CLAUSE, changed) <= 15
+
+    survivors = deduplicate_chunks([chunk(CLAUSE, "a.pdf"), chunk(changed, "b.pdf")], max_distance=15)
+
+    assert len(survivors) == 2
+    assert "merged_sources" not in survivors[0].metadata
+
+
+def test_duplicates_are_only_merged_within_a_category():
+    chunks = [chunk(CLAUSE, "a.pdf", "wills"), chunk(CLAUSE, "b.pdf", "probate")]
+
+    assert deduplicate_chunks(chunks) == chunks
+
+
+def test_merged_sources_lists_each_other_source_once():
+    chunks = [chunk(CLAUSE, "a.pdf"), chunk(CLAUSE, "a.pdf"), chunk(CLAUSE, "b.pdf"), chunk(CLAUSE, "b.pdf")]
+
+    survivors = deduplicate_chunks(chunks)
+
+    assert survivors[0].metadata["merged_sources"] == "b.pdf"
+    assert survivors[0].metadata["duplicate_count"] == 3
+
+
+def test_figures_keep_amounts_dates_and_percentages_whole():
+    assert figures("Pay £1,200.50 by 01/04/2024, then 2.5% within 14 days") == (
+        "1,200.50", "01/04/2024", "2.5%", "14"
+    )
+
+
+def test_max_distance_is_validated():
+    with pytest.raises(ValueError):
+        deduplicate_chunks([], max_distance=16)
@@ -0,0 +1,82 @@
+import json
+import os
+import pytest
+from backend.core.config import settings
+from benchmarks.eval_retrieval import GOLDEN_SET_PATH, evaluate_config, is_relevant, recommend
+
+
+DOCUMENTS_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "documents")
+
+
+def row(recall: float, tokens: float, mrr: float = 0.5) -> dict:
+    return {"recall_at_k": recall, "avg_context_tokens": tokens, "mrr": mrr}
+
+
+def test_is_relevant_matches_source_file_and_page():
+    expected = [{"source": "guide.pdf", "page": 2}]
+
+    assert is_relevant({"source": "/data/documents/guide.pdf", "page": 2}, expected)
+    assert not is_relevant({"source": "/data/documents/guide.pdf", "page": 3}, expected)
+    assert not is_relevant({"source": "/data/documents/other.pdf", "page": 2}, expected)
+
+
+def test_recommend_prefers_fewest_tokens_at_the_best_recall():
+    results = [row(0.9, 900), row(0.9, 400), row(0.8, 100)]
+
+    assert recommend(results, tolerance=0.0) == results[1]
+
+
+def test_recommend_trades_recall_within_the_tolerance():
+    results = [row(0.9, 900), row(0.85, 300, mrr=0.4), row(0.85, 300, mrr=0.6), row(0.5, 10)]
+
+    assert recommend(results, tolerance=0.1) == results[2]
+
+
+def test_golden_set_points_at_existing_pages(tmp_path, monkeypatch):
+    from backend.rag.ingestion import load_documents
+
+    monkeypatch.setattr(settings, "pdf_cache_path", str(tmp_path / "pdf_cache.sqlite3"))
+    with open(GOLDEN_SET_PATH, encoding="utf-8") as f:
+        golden = json.load(f)
+
+    pages = {
+        (os.path.basename(document.metadata["source"]), document.metadata.get("page"))
+        for document in load_documents(DOCUMENTS_PATH)
+    }
+
+    assert golden
+    for item in golden:
+        assert item["question"] and item["expected"]
+        for expected in item["expected"]:
+            assert (expected["source"], expected["page"]) in pages
+
+
+def test_evaluate_config_scores_every_k(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_batch_enabled", False)
+    monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+    documents = tmp_path / "documents"
+    documents.mkdir()
+    (documents / "fees.txt").write_text("A Single Will costs 90 pounds online.", encoding="utf-8")
+    (documents / "lpa.txt").write_text("An LPA must be registered before it can be used.", encoding="utf-8")
+    # The offline embeddings hash the text, so a question equal to a chunk retrieves it first
+    golden = [{
+        "question": "An LPA must be registered before it can be used.",
+        "expected": [{"source": "lpa.txt", "page": None}],
+    }]
+
+    results = evaluate_config({
+        "documents_path": str(documents),
+        "chunk_size": 500,
+        "chunk_overlap": 50,
+        "separators": "default",
+        "k_values": [1, 2],
+        "golden": golden,
+    })
+
+    assert [result["k"] for result in results] == [1, 2]
+    for result in results:
+        assert result["chunks"] == 2
+        assert result["recall_at_k"] == pytest.approx(1.0)
+        assert result["mrr"] == pytest.approx(1.0)
+        assert result["avg_context_tokens"] > 0
+        assert result["latency_p95_ms"] >= result["latency_p50_ms"]
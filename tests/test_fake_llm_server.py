@@ -0,0 +1,61 @@
+import json
+import httpx
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from backend.core.fake_llm_server import create_app
+
+
+pytestmark = pytest.mark.anyio
+
+PROMPT = "Context:\nProbate is the legal process of proving a will. It takes weeks.\nUser Question:\nWhat is probate?"
+ANSWER = "Probate is the legal process of proving a will. It takes weeks."
+
+
+@pytest.fixture
+def transport():
+    return httpx.ASGITransport(app=create_app())
+
+
+async def test_completion_answers_from_the_prompt_context(transport):
+    async with httpx.AsyncClient(transport=transport, base_url="http://fake") as client:
+        response = await client.post("/v1/chat/completions", json={
+            "model": "fake",
+            "messages": [{"role": "user", "content": PROMPT}],
+        })
+
+    body = response.json()
+    assert body["object"] == "chat.completion"
+    assert body["choices"][0]["message"]["content"] == ANSWER
+    assert body["usage"]["completion_tokens"] == len(ANSWER.split())
+
+
+async def test_streamed_completion_ends_with_done(transport):
+    async with httpx.AsyncClient(transport=transport, base_url="http://fake") as client:
+        response = await client.post("/v1/chat/completions", json={
+            "model": "fake",
+            "messages": [{"role": "user", "content": PROMPT}],
+            "stream": True,
+        })
+
+    events = [line[len("data: "):] for line in response.text.split("\n\n") if line]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    assert "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks) == ANSWER
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+
+
+async def test_openai_client_works_against_the_server(transport):
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        llm = ChatOpenAI(
+            api_key="fake",
+            base_url="http://fake/v1",
+            model="fake",
+            http_async_client=http_client,
+            stream_usage=True,
+        )
+
+        assert (await llm.ainvoke([HumanMessage(PROMPT)])).content == ANSWER
+        streamed = [chunk.content async for chunk in llm.astream([HumanMessage(PROMPT)])]
+        assert "".join(streamed) == ANSWER
+        assert len(streamed) > 1
@@ -0,0 +1,85 @@
+import json
+import os
+import pytest
+from backend.rag import guided_answers
+
+
+QUESTIONS = {
+    "probate": {"question": "What is probate?", "category": "legal"},
+    "register_death": {"question": "How do I register a death?", "category": "bereavement"},
+}
+
+
+@pytest.fixture
+def catalog(chroma_path, monkeypatch):
+    """A two-question catalog with answers stored under a temporary directory."""
+    monkeypatch.setattr(guided_answers, "get_guided_questions", lambda: QUESTIONS)
+    guided_answers._keys_by_question.cache_clear()
+    monkeypatch.setattr(guided_answers, "_store", {"generation": None, "mtime": None, "answers": {}})
+    generation = {"value": 1}
+    monkeypatch.setattr(guided_answers, "get_index_generation", lambda: generation["value"])
+    yield generation
+    guided_answers._keys_by_question.cache_clear()
+
+
+def write_answers(generation: int, answers: dict) -> None:
+    """Store answers the way another worker's precompute run would."""
+    directory = guided_answers.get_answers_directory()
+    os.makedirs(directory, exist_ok=True)
+    path = guided_answers._answers_file(generation)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(answers, f)
+    # Make the change visible even on filesystems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def answer(key: str, text: str) -> dict:
+    return {"key": key, "question": QUESTIONS[key]["question"], "answer": text, "sources": [], "generation": 1}
+
+
+def test_missing_answers_are_loaded_once_written(catalog):
+    assert guided_answers.get_guided_answer("probate") is None
+
+    write_answers(1, {"probate": answer("probate", "Proving a will.")})
+
+    assert guided_answers.get_guided_answer("probate")["answer"] == "Proving a will."
+
+
+def test_answers_rewritten_by_another_worker_are_reloaded(catalog):
+    write_answers(1, {"probate": answer("probate", "Old answer.")})
+    assert guided_answers.get_guided_answer("probate")["answer"] == "Old answer."
+
+    write_answers(1, {"probate": answer("probate", "New answer.")})
+
+    assert guided_answers.get_guided_answer("probate")["answer"] == "New answer."
+
+
+def test_new_generation_waits_for_its_own_answers(catalog):
+    write_answers(1, {"probate": answer("probate", "Generation 1.")})
+    assert guided_answers.get_guided_answer("probate") is not None
+
+    catalog["value"] = 2
+    assert guided_answers.get_guided_answer("probate") is None
+
+    write_answers(2, {"probate": answer("probate", "Generation 2.")})
+    assert guided_answers.get_guided_answer("probate")["answer"] == "Generation 2."
+
+
+def test_find_guided_answer_matches_normalized_question(catalog):
+    write_answers(1, {"probate": answer("probate", "Proving a will.")})
+
+    assert guided_answers.find_guided_answer("  what IS   probate? ")["key"] == "probate"
+    assert guided_answers.find_guided_answer("What is a will?") is None
+
+
+@pytest.mark.parametrize("filters, expected", [
+    (None, True),
+    ({"category": ["legal", "general"]}, True),
+    ({"category": "legal"}, True),
+    ({"category": ["bereavement"]}, False),
+    ({"source_name": "guide.pdf"}, False),
+    ({"category": None, "source": None}, True),
+])
+def test_filters_exclude_answers_outside_them(filters, expected):
+    assert guided_answers.filters_allow(filters, "legal") is expected
@@ -0,0 +1,54 @@
+import httpx
+import pytest
+from backend.core import health
+from backend.core.config import settings
+
+
+@pytest.fixture
+def llm_responses(monkeypatch):
+    """Serve the LLM health probe from a mock transport and record its requests."""
+    requests = []
+    status = {"code": 200}
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(status["code"], json={})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(health, "get_http_client", lambda: client)
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    return status, requests
+
+
+@pytest.mark.parametrize("code, expected", [(200, "up"), (401, "down"), (503, "down")])
+def test_llm_is_up_only_on_success(llm_responses, monkeypatch, code, expected):
+    status, _ = llm_responses
+    status["code"] = code
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+
+    result = health.run_check(health.check_llm)
+
+    assert result["status"] == expected
+    assert result["http_status"] == code
+
+
+def test_api_key_is_only_sent_to_openai(llm_responses, monkeypatch):
+    _, requests = llm_responses
+
+    monkeypatch.setattr(settings, "llm_provider", "ollama")
+    health.check_llm()
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    health.check_llm()
+
+    assert "authorization" not in requests[0].headers
+    assert requests[1].headers["authorization"] == "Bearer sk-test"
+
+
+def test_failing_check_is_down():
+    def broken():
+        raise ConnectionError("refused")
+
+    result = health.run_check(broken)
+
+    assert result["status"] == "down"
+    assert "refused" in result["error"]
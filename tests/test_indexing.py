@@ -0,0 +1,74 @@
+import pytest
+from backend.core.config import settings
+from backend.rag import indexing
+from backend.rag.retriever import get_active_alias, list_generations, similarity_search
+
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch, chroma_path):
+    path = tmp_path / "documents"
+    path.mkdir()
+    monkeypatch.setattr(settings, "documents_path", str(path))
+    monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+    monkeypatch.setattr(settings, "index_generations_kept", 2)
+    (path / "wills.txt").write_text("A Mirror Will is two matching wills for a couple.", encoding="utf-8")
+    return path
+
+
+def test_build_activates_a_new_generation(documents):
+    assert indexing.build_index() == 1
+
+    assert get_active_alias() == {"collection": "documents_g1", "generation": 1}
+    assert [doc.page_content for doc in similarity_search("mirror wills", k=1)] == [
+        "A Mirror Will is two matching wills for a couple."
+    ]
+    assert indexing.BUILD_STATUS["state"] == "completed"
+
+
+def test_rebuild_swaps_and_keeps_the_previous_generation(documents):
+    indexing.build_index()
+    (documents / "lpa.txt").write_text("An LPA must be registered before use.", encoding="utf-8")
+
+    indexing.build_index()
+    assert get_active_alias()["generation"] == 2
+    assert sorted(list_generations().values()) == [1, 2]
+    assert len(similarity_search("anything", k=5)) == 2
+
+    indexing.build_index()
+    assert sorted(list_generations().values()) == [2, 3]
+
+
+def test_failed_build_leaves_the_active_generation(documents, monkeypatch):
+    indexing.build_index()
+
+    def reject(collection_name, chunks):
+        raise ValueError("probe chunk missing")
+
+    monkeypatch.setattr(indexing, "validate_generation", reject)
+    with pytest.raises(ValueError):
+        indexing.build_index()
+
+    assert get_active_alias()["generation"] == 1
+    assert "documents_g2" not in list_generations()
+    assert indexing.BUILD_STATUS["state"] == "failed"
+    assert indexing.BUILD_STATUS["error"] == "probe chunk missing"
+
+
+def test_empty_build_is_not_activated(documents):
+    (documents / "wills.txt").unlink()
+
+    with pytest.raises(ValueError, match="No chunks"):
+        indexing.build_index()
+    assert get_active_alias()["generation"] == 0
+
+
+def test_only_one_build_runs_at_a_time(documents):
+    activated = []
+
+    assert indexing.start_build()
+    assert not indexing.start_build()
+    indexing.run_build(on_activated=activated.append)
+
+    assert activated == [1]
+    assert indexing.start_build()
+    indexing.run_build()
@@ -0,0 +1,33 @@
+import pytest
+from backend.rag.ingestion import DEFAULT_CATEGORY, infer_category
+from backend.rag.retriever import build_filter
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Registering an LPA takes up to 20 weeks.", "legal"),
+    ("Our probate team helps the executor.", "bereavement"),
+    ("Set up NAGS reminders for your funeral plan.", "final_wishes"),
+    ("Pricing and account settings.", DEFAULT_CATEGORY),
+])
+def test_infer_category_from_keywords(text, expected):
+    assert infer_category(text) == expected
+
+
+def test_infer_category_ignores_keywords_inside_other_words():
+    # "snags" contains "nags" and "flpa" contains "lpa"
+    assert infer_category("The upload snags on large files; see the FLPA appendix.") == DEFAULT_CATEGORY
+    assert infer_category("Probate snags: the executor must wait.") == "bereavement"
+
+
+def test_build_filter_translates_values_and_lists():
+    assert build_filter(None) is None
+    assert build_filter({"category": None, "source_name": []}) is None
+    assert build_filter({"category": "legal"}) == {"category": "legal"}
+    assert build_filter({"category": ["legal", "general"], "source_name": "guide.pdf"}) == {
+        "$and": [{"category": {"$in": ["legal", "general"]}}, {"source_name": "guide.pdf"}]
+    }
+
+
+def test_build_filter_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        build_filter({"page": 3})
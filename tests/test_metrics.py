@@ -0,0 +1,73 @@
+import asyncio
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from backend.core.metrics import REQUEST_LATENCY, RequestLatencyMiddleware
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(RequestLatencyMiddleware)
+
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    async def item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    app.include_router(router, prefix="/api")
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for _ in range(5):
+                await asyncio.sleep(0.05)
+                yield b"x"
+        return StreamingResponse(body())
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def observed(route: str, status: str):
+    """Count and total seconds recorded for one route and status."""
+    samples = {
+        sample.name: sample.value
+        for metric in REQUEST_LATENCY.collect()
+        for sample in metric.samples
+        if sample.labels.get("route") == route and sample.labels.get("status") == status
+    }
+    return samples.get("http_request_duration_seconds_count", 0), samples.get("http_request_duration_seconds_sum", 0)
+
+
+async def test_latency_is_labelled_by_route_template_and_status(client):
+    before_ok = observed("/api/items/{item_id}", "200")[0]
+    before_missing = observed("/api/items/{item_id}", "404")[0]
+    before_unmatched = observed("unmatched", "404")[0]
+
+    async with client:
+        await client.get("/api/items/1")
+        await client.get("/api/items/2")
+        await client.get("/api/items/0")
+        await client.get("/nowhere")
+
+    assert observed("/api/items/{item_id}", "200")[0] == before_ok + 2
+    assert observed("/api/items/{item_id}", "404")[0] == before_missing + 1
+    assert observed("unmatched", "404")[0] == before_unmatched + 1
+
+
+async def test_streamed_latency_covers_the_whole_body(client):
+    count, total = observed("/stream", "200")
+
+    async with client:
+        response = await client.get("/stream")
+
+    assert response.content == b"xxxxx"
+    assert observed("/stream", "200")[0] == count + 1
+    assert observed("/stream", "200")[1] - total >= 0.25
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from backend.core import profiling
+from backend.core.config import settings
+
+
+pytestmark = pytest.mark.anyio
+
+TOKEN = "secret-token"
+PROFILE = {"x-profile": "1", "x-profile-token": TOKEN}
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", TOKEN)
+    monkeypatch.setattr(settings, "profile_output_dir", str(tmp_path))
+
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.2)
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for _ in range(20):
+                await asyncio.sleep(0.02)
+                yield b"x"
+        return StreamingResponse(body())
+
+    app.add_middleware(profiling.ProfilingMiddleware)
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def test_profile_is_written_for_a_valid_token(client, tmp_path):
+    response = await client.get("/ok", headers=PROFILE)
+
+    profile_id = response.headers["x-profile-id"]
+    artifact = json.loads((tmp_path / f"{profile_id}.json").read_text())
+    assert artifact["path"] == "/ok"
+    assert artifact["scope"] == "process"
+
+
+async def test_token_is_only_accepted_in_the_header(client):
+    response = await client.get("/ok", params={"profile": "1", "profile_token": TOKEN})
+    assert "x-profile-id" not in response.headers
+
+    response = await client.get("/ok", headers={**PROFILE, "x-profile-token": "wrong"})
+    assert "x-profile-id" not in response.headers
+
+
+async def test_concurrent_requests_are_recorded(client, tmp_path):
+    profiled, _ = await asyncio.gather(
+        client.get("/slow", headers=PROFILE),
+        client.get("/slow"),
+    )
+
+    artifact = json.loads((tmp_path / f"{profiled.headers['x-profile-id']}.json").read_text())
+    assert artifact["concurrent_requests"] == 1
+
+
+async def test_lock_is_released_when_the_client_disconnects(app):
+    scope = {
+        "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream",
+        "query_string": b"", "root_path": "", "scheme": "http", "http_version": "1.1",
+        "server": ("test", 80), "client": ("client", 1),
+        "headers": [(b"x-profile", b"1"), (b"x-profile-token", TOKEN.encode())],
+    }
+
+    async def receive():
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    task = asyncio.create_task(app(scope, receive, send))
+    await asyncio.sleep(0.1)
+    assert profiling._profile_lock.locked()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert not profiling._profile_lock.locked()
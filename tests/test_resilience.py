@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from backend.core.resilience import ResilientChatModel, get_llm_stats
+
+
+class ScriptedModel(BaseChatModel):
+    """Chat model with a fixed answer, delay and failure mode, recording how its streams end."""
+
+    text: str = "ok"
+    delay: float = 0.0
+    fail: bool = False
+    fail_first_times: int = 0
+    calls: list = []
+    closed_streams: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _answer(self) -> str:
+        self.calls.append(time.monotonic())
+        if self.fail or len(self.calls) <= self.fail_first_times:
+            raise RuntimeError("provider error")
+        return self.text
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer()))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer()))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        try:
+            for word in self._answer().split():
+                time.sleep(self.delay)
+                yield ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+        finally:
+            self.closed_streams.append("sync")
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        try:
+            for word in self._answer().split():
+                await asyncio.sleep(self.delay)
+                yield ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+        finally:
+            self.closed_streams.append("async")
+
+
+def model(**fields) -> ScriptedModel:
+    return ScriptedModel(calls=[], closed_streams=[], **fields)
+
+
+def resilient(primary, fallbacks=(), **fields) -> ResilientChatModel:
+    fields.setdefault("hedge_enabled", False)
+    return ResilientChatModel(primary=primary, fallbacks=list(fallbacks), **fields)
+
+
+def test_fallback_answers_when_the_primary_fails():
+    llm = resilient(model(fail=True), [model(text="fallback")])
+
+    assert llm.invoke("hi").content == "fallback"
+
+
+@pytest.mark.anyio
+async def test_async_fallback_answers_when_the_primary_fails():
+    llm = resilient(model(fail=True), [model(text="fallback")])
+
+    assert (await llm.ainvoke("hi")).content == "fallback"
+
+
+def test_deadline_covers_primary_and_fallbacks():
+    llm = resilient(model(delay=0.3, fail=True), [model(delay=0.5, text="late")], deadline=0.5)
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        llm.invoke("hi")
+    assert time.monotonic() - start < 0.7
+
+
+@pytest.mark.anyio
+async def test_async_deadline_covers_primary_and_fallbacks():
+    llm = resilient(model(delay=0.3, fail=True), [model(delay=0.5, text="late")], deadline=0.5)
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        await llm.ainvoke("hi")
+    assert time.monotonic() - start < 0.7
+
+
+@pytest.mark.anyio
+async def test_slow_primary_is_hedged():
+    primary = model(delay=0.3, text="hedged")
+    llm = resilient(primary, hedge_enabled=True, hedge_delay=0.05, deadline=2)
+    hedged = get_llm_stats()["hedged"]
+
+    assert (await llm.ainvoke("hi")).content == "hedged"
+    assert get_llm_stats()["hedged"] == hedged + 1
+
+
+@pytest.mark.anyio
+async def test_async_stream_holds_no_thread():
+    llm = resilient(model(text="a b c d", delay=0.02))
+    threads = threading.active_count()
+
+    chunks = [chunk.content async for chunk in llm.astream("hi")]
+
+    assert "".join(chunks) == "a b c d "
+    assert threading.active_count() == threads
+
+
+@pytest.mark.anyio
+async def test_async_stream_stops_at_the_deadline():
+    llm = resilient(model(text="a b c d e f", delay=0.15), deadline=0.4)
+
+    received = []
+    with pytest.raises(TimeoutError):
+        async for chunk in llm.astream("hi"):
+            received.append(chunk.content)
+    assert 0 < len(received) < 6
+
+
+def test_stream_falls_back_and_closes_the_failed_stream():
+    primary = model(fail=True)
+    llm = resilient(primary, [model(text="x y")])
+
+    assert "".join(chunk.content for chunk in llm.stream("hi")) == "x y "
+    assert primary.closed_streams == ["sync"]
+
+
+def test_stream_closes_the_model_stream_when_the_consumer_stops():
+    primary = model(text="a b c d")
+    stream = resilient(primary).stream("hi")
+
+    next(stream)
+    stream.close()
+
+    assert primary.closed_streams == ["sync"]
+
+
+def test_stream_closes_the_model_stream_at_the_deadline():
+    primary = model(text="a b c d e f", delay=0.15)
+    llm = resilient(primary, deadline=0.4)
+
+    with pytest.raises(TimeoutError):
+        for _ in llm.stream("hi"):
+            pass
+
+    assert primary.closed_streams == ["sync"]
@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from backend.rag.singleflight import SingleFlight, request_key
+
+
+pytestmark = pytest.mark.anyio
+
+
+def test_request_key_normalizes_the_question_only():
+    assert request_key("What is  an LPA?") == request_key("what is an lpa?")
+    assert request_key("What is an LPA?", {"category": "lpa"}) != request_key("What is an LPA?")
+    assert request_key("What is an LPA?", context="earlier turn") != request_key("What is an LPA?")
+
+
+async def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert results == ["answer"] * 5
+    assert len(runs) == 1
+    assert flight.shared_count == 4
+    assert await flight.do("key", work) == "answer"
+    assert len(runs) == 2
+
+
+async def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("LLM down")
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True)
+
+    assert [str(result) for result in results] == ["LLM down"] * 3
+
+
+async def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    first = asyncio.ensure_future(flight.do("key", work))
+    second = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "answer"
+
+
+async def test_late_subscribers_replay_the_whole_stream():
+    flight = SingleFlight()
+    starts = []
+
+    async def tokens():
+        starts.append(1)
+        for token in ["a", "b", "c"]:
+            await asyncio.sleep(0.02)
+            yield token
+
+    async def collect(delay):
+        await asyncio.sleep(delay)
+        return [token async for token in flight.stream("key", tokens)]
+
+    results = await asyncio.gather(collect(0), collect(0.03))
+
+    assert results == [["a", "b", "c"]] * 2
+    assert len(starts) == 1
+
+
+async def test_stream_errors_reach_subscribers_after_the_sent_tokens():
+    flight = SingleFlight()
+
+    async def tokens():
+        yield "a"
+        raise RuntimeError("stream broke")
+
+    received = []
+    with pytest.raises(RuntimeError, match="stream broke"):
+        async for token in flight.stream("key", tokens):
+            received.append(token)
+    assert received == ["a"]